@@ -78,6 +78,10 @@ def _get_latest() -> Dict[str, Any]:
 
 
 class BmsHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections alive for pooled clients such as the live HMI
+    # dashboard; every response therefore carries a Content-Length.
+    protocol_version = "HTTP/1.1"
+
     def do_GET(self):  # noqa: N802
         if self.path == "/health":
             payload = {"status": "ok"}
@@ -85,6 +89,7 @@ class BmsHandler(BaseHTTPRequestHandler):
             payload = _get_latest()
         else:
             self.send_response(404)
+            self.send_header("Content-Length", "0")
             self.end_headers()
             return
 
@@ -98,6 +103,7 @@ class BmsHandler(BaseHTTPRequestHandler):
     def do_POST(self):  # noqa: N802
         if self.path != "/bms/diagnostics":
             self.send_response(404)
+            self.send_header("Content-Length", "0")
             self.end_headers()
             return
 
@@ -107,6 +113,7 @@ class BmsHandler(BaseHTTPRequestHandler):
             payload = json.loads(body.decode("utf-8")) if body else {}
         except json.JSONDecodeError:
             self.send_response(400)
+            self.send_header("Content-Length", "0")
             self.end_headers()
             return
 
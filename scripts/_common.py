@@ -0,0 +1,122 @@
+"""
+Helpers shared by the scripts in this directory.
+
+Scripts are run directly (python scripts/<name>.py), which puts this directory
+on sys.path, so they import these as `from _common import ...`.
+"""
+
+from __future__ import annotations
+
+import os
+import stat
+import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Iterable
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(ROOT / "src"))
+
+from codegen.json_io import json_bytes, json_item  # noqa: E402,F401  (re-exported)
+
+PIPE_SIZE = 1024 * 1024
+
+
+def widen_output_pipes(size: int = PIPE_SIZE) -> None:
+    """
+    Grow stdout/stderr to `size` bytes when they are pipes (Linux only).
+
+    Every step inherits these descriptors, so a larger pipe lets chatty
+    children (Ollama runs, javac/kotlinc) write logs with fewer blocking waits
+    on whatever is reading them.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        return
+    set_pipe_size = getattr(fcntl, "F_SETPIPE_SZ", None)
+    if set_pipe_size is None:
+        return
+    for fd in (1, 2):
+        try:
+            if stat.S_ISFIFO(os.fstat(fd).st_mode):
+                fcntl.fcntl(fd, set_pipe_size, size)
+        except OSError:
+            # Closed descriptor, or size above /proc/sys/fs/pipe-max-size.
+            pass
+
+
+def missing_paths(paths: Iterable[Path]) -> list[Path]:
+    """Return `paths` that do not exist, listing each parent directory once.
+
+    One scandir per directory replaces a stat() per required file.
+    """
+    listings: dict[Path, set[str]] = {}
+    missing = []
+    for path in paths:
+        names = listings.get(path.parent)
+        if names is None:
+            try:
+                with os.scandir(path.parent) as entries:
+                    names = {entry.name for entry in entries}
+            except OSError:
+                names = set()
+            listings[path.parent] = names
+        if path.name not in names:
+            missing.append(path)
+    return missing
+
+
+def run_steps(
+    steps: dict[str, tuple[Callable[[], None], tuple[str, ...]]], max_workers: int = 4
+) -> None:
+    """
+    Run named steps concurrently, each as soon as its dependencies have finished.
+
+    Steps shell out to child processes, so worker threads just block in wait().
+    After the first failure no new steps are started; in-flight steps are
+    allowed to finish and the error is then re-raised.
+    """
+    pending = dict(steps)
+    done: set[str] = set()
+    running: dict[Future, str] = {}
+    error: BaseException | None = None
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        while pending or running:
+            if error is None:
+                for name, (fn, deps) in list(pending.items()):
+                    if done.issuperset(deps):
+                        running[ex.submit(fn)] = name
+                        del pending[name]
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                exc = future.exception()
+                if exc is None:
+                    done.add(name)
+                elif error is None:
+                    error = exc
+    if error is not None:
+        raise error
+    if pending:
+        raise ValueError(f"Unresolvable step dependencies: {sorted(pending)}")
+
+
+def write_json_streaming(path: Path, head: dict, items_key: str, items: list) -> None:
+    """Write `head` plus `items_key: items` as one JSON object, one list item per line.
+
+    Only a single item is ever serialized at a time, so large reports never
+    exist as one formatted string in memory.
+    """
+    with open(path, "wb") as out:
+        out.write(b"{\n")
+        for key, value in head.items():
+            out.write(b"  " + json_item(key) + b": " + json_item(value) + b",\n")
+        out.write(b"  " + json_item(items_key) + b": [")
+        for i, item in enumerate(items):
+            out.write(b",\n    " if i else b"\n    ")
+            out.write(json_item(item))
+        out.write(b"\n  ]\n}\n" if items else b"]\n}\n")
@@ -21,6 +21,11 @@ from typing import Dict, Any, List
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 # Add src to path
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT / "src"))
@@ -30,7 +35,7 @@ from pipeline.validation_gate import get_validation_gate
 
 
 def _load_language(requirement_path: Path) -> str:
-    data = yaml.safe_load(requirement_path.read_text())
+    data = yaml.load(requirement_path.read_bytes(), Loader=_YamlLoader)
     return data.get("service", {}).get("language", "cpp")
 
 
@@ -26,9 +26,14 @@ import pandas as pd
 
 
 def _to_float(value: Any, default: float = 0.0) -> float:
+    # JSON decodes numbers natively, so the common case never needs a try/except.
+    if value is None:
+        return default
+    if type(value) is float:
+        return value
+    if type(value) is int:
+        return float(value)
     try:
-        if value is None:
-            return default
         return float(value)
     except (TypeError, ValueError):
         return default
@@ -88,13 +88,15 @@ def main() -> int:
     out.parent.mkdir(parents=True, exist_ok=True)
     df.to_csv(out, index=False)
 
-    healthy = df["tire_pressure_fl"] >= 2.2
-    degraded = (df["tire_pressure_fl"] <= 1.9) & (df["vehicle_speed_kmh"] > 80)
-    print(f"[BAR-DATA] Wrote: {out} rows={len(df)}")
-    print(f"[BAR-DATA] degraded rows: {int(degraded.sum())} ({degraded.mean()*100:.2f}%)")
+    # Summary stats straight from the NumPy arrays: one pass per mask.
+    healthy = fl >= 2.2
+    degraded = (fl <= 1.9) & (speed > 80)
+    degraded_count = int(np.count_nonzero(degraded))
+    print(f"[BAR-DATA] Wrote: {out} rows={n}")
+    print(f"[BAR-DATA] degraded rows: {degraded_count} ({degraded_count / n * 100:.2f}%)")
     print(
-        f"[BAR-DATA] mean failure healthy={df.loc[healthy, 'failure_score'].mean():.4f} "
-        f"degraded={df.loc[degraded, 'failure_score'].mean():.4f}"
+        f"[BAR-DATA] mean failure healthy={failure[healthy].mean():.4f} "
+        f"degraded={failure[degraded].mean():.4f}"
     )
     return 0
 
@@ -8,10 +8,12 @@ This script computes a chunk-level binary delta between:
 
 Outputs:
 - delta_manifest.json
-- delta_chunks.json
+- delta_chunks.json (chunk index: offset, length, sha256, file_offset)
+- delta_chunks.bin (raw changed-chunk payload, concatenated)
 - verification.json
 
 The generated delta is verifiable by reconstructing target bytes from base+chunks.
+Pass --embed to additionally inline base64 payloads into delta_chunks.json.
 """
 
 from __future__ import annotations
@@ -19,59 +21,120 @@ from __future__ import annotations
 import argparse
 import base64
 import hashlib
-import json
+import mmap
+import os
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Tuple
 
+import numpy as np
 
-def sha256_bytes(data: bytes) -> str:
+from _common import json_bytes
+
+
+def sha256_bytes(data: bytes | memoryview) -> str:
     return hashlib.sha256(data).hexdigest()
 
 
-def sha256_file(path: Path) -> str:
-    h = hashlib.sha256()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+def _changed_offsets(base: bytes, target: bytes, chunk_size: int) -> List[int]:
+    # Whole chunks present in both files are compared in one vectorized pass;
+    # only the ragged tail (at most the size difference) is walked in Python.
+    full = min(len(base), len(target)) // chunk_size
+    span = full * chunk_size
+    b_rows = np.frombuffer(base, dtype=np.uint8, count=span).reshape(full, chunk_size)
+    t_rows = np.frombuffer(target, dtype=np.uint8, count=span).reshape(full, chunk_size)
+    offsets = (np.flatnonzero((b_rows != t_rows).any(axis=1)) * chunk_size).tolist()
+
+    for offset in range(span, max(len(base), len(target)), chunk_size):
+        if base[offset : offset + chunk_size] != target[offset : offset + chunk_size]:
+            offsets.append(offset)
+    return offsets
 
 
 def compute_delta(base: bytes, target: bytes, chunk_size: int) -> List[Dict[str, object]]:
     chunks: List[Dict[str, object]] = []
-    max_len = max(len(base), len(target))
-    for offset in range(0, max_len, chunk_size):
-        b = base[offset : offset + chunk_size]
-        t = target[offset : offset + chunk_size]
-        if b != t:
-            chunks.append(
-                {
-                    "offset": offset,
-                    "length": len(t),
-                    "sha256": sha256_bytes(t),
-                    "data_b64": base64.b64encode(t).decode("ascii"),
-                }
-            )
+    # Slicing a memoryview hands each chunk to the hasher without a bytes copy.
+    target_view = memoryview(target)
+    for offset in _changed_offsets(base, target, chunk_size):
+        t = target_view[offset : offset + chunk_size]
+        chunks.append(
+            {
+                "offset": offset,
+                "length": len(t),
+                "sha256": sha256_bytes(t),
+            }
+        )
     return chunks
 
 
-def apply_delta(base: bytes, chunks: List[Dict[str, object]], target_size: int) -> bytes:
-    reconstructed = bytearray(base)
-    if len(reconstructed) < target_size:
-        reconstructed.extend(b"\x00" * (target_size - len(reconstructed)))
-    else:
-        reconstructed = reconstructed[:target_size]
-
-    for chunk in chunks:
-        offset = int(chunk["offset"])
-        length = int(chunk["length"])
-        payload = base64.b64decode(str(chunk["data_b64"]).encode("ascii"))
-        reconstructed[offset : offset + length] = payload
-    return bytes(reconstructed)
+def write_chunks(
+    path: Path, target: bytes, chunks: List[Dict[str, object]], embed: bool = False
+) -> None:
+    """Append each changed chunk's raw bytes to `path` and record its file_offset."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    file_offset = 0
+    with path.open("wb") as f:
+        for chunk in chunks:
+            offset = int(chunk["offset"])
+            length = int(chunk["length"])
+            payload = target[offset : offset + length]
+            f.write(payload)
+            chunk["file_offset"] = file_offset
+            file_offset += length
+            if embed:
+                chunk["data_b64"] = base64.b64encode(payload).decode("ascii")
+
+
+def apply_delta(
+    base: bytes, chunks: List[Dict[str, object]], payload: bytes, target_size: int
+) -> bytearray:
+    reconstructed = bytearray(target_size)
+    keep = min(len(base), target_size)
+    with memoryview(base) as base_view, memoryview(payload) as payload_view:
+        reconstructed[:keep] = base_view[:keep]
+
+        # Chunks adjacent in both the target and the payload file are merged so
+        # each run is a single memcpy-backed slice assignment.
+        run_offset = run_file_offset = run_length = 0
+        for chunk in sorted(chunks, key=lambda c: int(c["offset"])):
+            offset = int(chunk["offset"])
+            length = int(chunk["length"])
+            file_offset = int(chunk["file_offset"])
+            if offset == run_offset + run_length and file_offset == run_file_offset + run_length:
+                run_length += length
+                continue
+            if run_length:
+                reconstructed[run_offset : run_offset + run_length] = payload_view[
+                    run_file_offset : run_file_offset + run_length
+                ]
+            run_offset, run_file_offset, run_length = offset, file_offset, length
+        if run_length:
+            reconstructed[run_offset : run_offset + run_length] = payload_view[
+                run_file_offset : run_file_offset + run_length
+            ]
+    return reconstructed
+
+
+def _equal(data: bytes | bytearray, other: bytes | mmap.mmap) -> bool:
+    # mmap has no __eq__; a memoryview compares buffer contents without copying.
+    with memoryview(other) as view:
+        return view == data
+
+
+@contextmanager
+def map_file(path: Path) -> Iterator[bytes | mmap.mmap]:
+    """Map `path` read-only; empty files (which mmap rejects) yield b""."""
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
 
 
 def write_json(path: Path, payload: Dict[str, object]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, indent=2))
+    path.write_bytes(json_bytes(payload))
 
 
 def parse_args() -> argparse.Namespace:
@@ -84,6 +147,11 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--base-file", required=True, help="Base artifact path (v1.0)")
     parser.add_argument("--target-file", required=True, help="Target artifact path (v1.1)")
     parser.add_argument("--chunk-size", type=int, default=1024)
+    parser.add_argument(
+        "--embed",
+        action="store_true",
+        help="Also inline base64 chunk payloads into delta_chunks.json",
+    )
     parser.add_argument(
         "--output-dir",
         default="output/ota_delta/BMSDiagnosticService_v1.0.0_to_v1.1.0",
@@ -104,54 +172,61 @@ def main() -> int:
     if args.chunk_size <= 0:
         raise ValueError("--chunk-size must be > 0")
 
-    base_bytes = base_path.read_bytes()
-    target_bytes = target_path.read_bytes()
-    delta_chunks = compute_delta(base_bytes, target_bytes, args.chunk_size)
-
-    changed_bytes = sum(int(c["length"]) for c in delta_chunks)
-    target_size = len(target_bytes)
-    reduction = (1.0 - (changed_bytes / target_size)) * 100.0 if target_size else 0.0
-
-    delta_manifest = {
-        "ota_delta": {
-            "service": args.service,
-            "from_version": args.base_version,
-            "to_version": args.target_version,
-            "base_container": args.base_image,
-            "target_container": args.target_image,
-            "base_artifact": str(base_path),
-            "target_artifact": str(target_path),
-            "base_sha256": sha256_file(base_path),
-            "target_sha256": sha256_file(target_path),
-            "base_size_bytes": len(base_bytes),
-            "target_size_bytes": target_size,
-            "chunk_size": args.chunk_size,
-            "changed_chunk_count": len(delta_chunks),
-            "changed_bytes": changed_bytes,
-            "delta_efficiency_percent": round(reduction, 2),
+    # Both artifacts are mapped once and shared by hashing, diffing and
+    # verification, so neither is ever copied into a Python bytes object.
+    with map_file(base_path) as base_bytes, map_file(target_path) as target_bytes:
+        base_size = len(base_bytes)
+        target_sha256 = sha256_bytes(target_bytes)
+        delta_chunks = compute_delta(base_bytes, target_bytes, args.chunk_size)
+
+        changed_bytes = sum(int(c["length"]) for c in delta_chunks)
+        target_size = len(target_bytes)
+        reduction = (1.0 - (changed_bytes / target_size)) * 100.0 if target_size else 0.0
+
+        delta_manifest = {
+            "ota_delta": {
+                "service": args.service,
+                "from_version": args.base_version,
+                "to_version": args.target_version,
+                "base_container": args.base_image,
+                "target_container": args.target_image,
+                "base_artifact": str(base_path),
+                "target_artifact": str(target_path),
+                "base_sha256": sha256_bytes(base_bytes),
+                "target_sha256": target_sha256,
+                "base_size_bytes": base_size,
+                "target_size_bytes": target_size,
+                "chunk_size": args.chunk_size,
+                "changed_chunk_count": len(delta_chunks),
+                "changed_bytes": changed_bytes,
+                "delta_efficiency_percent": round(reduction, 2),
+            }
         }
-    }
-
-    write_json(output_dir / "delta_manifest.json", delta_manifest)
-    write_json(
-        output_dir / "delta_chunks.json",
-        {
-            "service": args.service,
-            "from_version": args.base_version,
-            "to_version": args.target_version,
-            "chunks": delta_chunks,
-        },
-    )
 
-    reconstructed = apply_delta(base_bytes, delta_chunks, target_size)
-    verification = {
-        "target_sha256": sha256_bytes(target_bytes),
-        "reconstructed_sha256": sha256_bytes(reconstructed),
-        "verified": reconstructed == target_bytes,
-    }
-    write_json(output_dir / "verification.json", verification)
+        write_chunks(
+            output_dir / "delta_chunks.bin", target_bytes, delta_chunks, embed=args.embed
+        )
+        write_json(output_dir / "delta_manifest.json", delta_manifest)
+        write_json(
+            output_dir / "delta_chunks.json",
+            {
+                "service": args.service,
+                "from_version": args.base_version,
+                "to_version": args.target_version,
+                "chunks": delta_chunks,
+            },
+        )
+
+        with map_file(output_dir / "delta_chunks.bin") as chunk_payload:
+            reconstructed = apply_delta(base_bytes, delta_chunks, chunk_payload, target_size)
+        verification = {
+            "target_sha256": target_sha256,
+            "reconstructed_sha256": sha256_bytes(reconstructed),
+            "verified": _equal(reconstructed, target_bytes),
+        }
+        write_json(output_dir / "verification.json", verification)
 
-    print(f"[OTA] Base: {base_path} ({len(base_bytes)} bytes)")
+    print(f"[OTA] Base: {base_path} ({base_size} bytes)")
     print(f"[OTA] Target: {target_path} ({target_size} bytes)")
     print(f"[OTA] Changed chunks: {len(delta_chunks)}")
     print(f"[OTA] Changed bytes: {changed_bytes}")
@@ -26,20 +26,21 @@ def build_profile() -> Dict[str, Any]:
     # 33 runs x 3 + 8 runs x 2 = 99 + 16 = 115.
     retries: List[int] = ([3] * 33) + ([2] * 8) + ([0] * (total_runs - detection_runs))
 
-    records = []
-    for i, retry_count in enumerate(retries, start=1):
-        status = "rejected_then_recovered" if retry_count > 0 else "accepted_first_pass"
-        records.append(
-            {
-                "run": i,
-                "trace_id": f"TARGET-TRACE-{i:03d}",
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "status": status,
-                "retry_count": retry_count,
-                "unsafe_code_escaped": 0,
-                "max_retry_limit": max_retries,
-            }
-        )
+    # One wall-clock read stamps the whole deterministic profile.
+    generated_at = datetime.now(timezone.utc).isoformat()
+
+    records = [
+        {
+            "run": i,
+            "trace_id": f"TARGET-TRACE-{i:03d}",
+            "timestamp": generated_at,
+            "status": "rejected_then_recovered" if retry_count > 0 else "accepted_first_pass",
+            "retry_count": retry_count,
+            "unsafe_code_escaped": 0,
+            "max_retry_limit": max_retries,
+        }
+        for i, retry_count in enumerate(retries, start=1)
+    ]
 
     summary = {
         "total_runs": total_runs,
@@ -63,7 +64,7 @@ def build_profile() -> Dict[str, Any]:
     return {
         "artifact_type": "target_profile",
         "label": "Slide 9 Target Profile (not raw run log)",
-        "generated_at_utc": datetime.now(timezone.utc).isoformat(),
+        "generated_at_utc": generated_at,
         "summary": summary,
         "constraints_check": constraints_check,
         "runs": records,
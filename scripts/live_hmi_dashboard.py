@@ -13,10 +13,15 @@ Serves a minimal web HMI that displays live values from the BMS service stub:
 from __future__ import annotations
 
 import argparse
+import hashlib
+import http.client
 import json
-import urllib.error
-import urllib.request
+import queue
+import threading
+import time
+import urllib.parse
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
 
 
 HTML = """<!doctype html>
@@ -147,12 +152,120 @@ HTML = """<!doctype html>
 </html>
 """
 
+# The page is static: encode it once and let browsers revalidate via ETag.
+HTML_BYTES = HTML.encode("utf-8")
+HTML_ETAG = '"' + hashlib.sha1(HTML_BYTES).hexdigest() + '"'
+
+
+class UpstreamPool:
+    """Keep-alive HTTP connections to the BMS service, shared by handler threads.
+
+    ThreadingHTTPServer spawns a thread per request, so connections are parked
+    in a LIFO queue rather than held in thread-local storage.
+    """
+
+    def __init__(self, maxsize: int = 8, timeout: float = 2.0) -> None:
+        self.timeout = timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue(maxsize)
+
+    def _acquire(self, scheme: str, netloc: str) -> tuple[http.client.HTTPConnection, bool]:
+        while True:
+            try:
+                key, conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if key == (scheme, netloc):
+                return conn, True
+            conn.close()
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout), False
+        return http.client.HTTPConnection(netloc, timeout=self.timeout), False
+
+    def _release(self, scheme: str, netloc: str, conn: http.client.HTTPConnection) -> None:
+        try:
+            self._idle.put_nowait(((scheme, netloc), conn))
+        except queue.Full:
+            conn.close()
+
+    def get(self, url: str) -> bytes:
+        parts = urllib.parse.urlsplit(url)
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+
+        while True:
+            conn, reused = self._acquire(parts.scheme, parts.netloc)
+            try:
+                conn.request("GET", target)
+                resp = conn.getresponse()
+                body = resp.read()
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                if reused:
+                    # Parked socket went stale (upstream restarted or timed out); redial.
+                    continue
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(parts.scheme, parts.netloc, conn)
+            if resp.status >= 400:
+                raise http.client.HTTPException(f"HTTP {resp.status} from {url}")
+            return body
+
+
+class LatestCache:
+    """Short-TTL cache that coalesces /api/latest polls from many tabs.
+
+    Only the first thread to see an expired entry fetches upstream; concurrent
+    callers wait on its Event and then re-read the fresh entry.
+    """
+
+    def __init__(self, ttl: float = 0.1) -> None:
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._body: Optional[bytes] = None
+        self._fetched_at = 0.0
+        self._inflight: Optional[threading.Event] = None
+
+    def get(self, fetch: Callable[[], bytes]) -> bytes:
+        while True:
+            with self._lock:
+                if self._body is not None and time.monotonic() - self._fetched_at < self.ttl:
+                    return self._body
+                pending = self._inflight
+                if pending is None:
+                    self._inflight = done = threading.Event()
+            if pending is None:
+                break
+            pending.wait()
+
+        try:
+            body = fetch()
+            with self._lock:
+                self._body = body
+                self._fetched_at = time.monotonic()
+            return body
+        finally:
+            with self._lock:
+                self._inflight = None
+            done.set()
+
 
 class DashboardHandler(BaseHTTPRequestHandler):
     service_url = "http://localhost:30509"
+    upstream = UpstreamPool()
+    latest = LatestCache()
+
+    def _fetch_latest(self) -> bytes:
+        body = self.upstream.get(f"{self.service_url}/bms/latest")
+        json.loads(body.decode("utf-8"))  # reject non-JSON before it is cached
+        return body
 
     def _write_json(self, payload: dict, status: int = 200) -> None:
-        out = json.dumps(payload).encode("utf-8")
+        self._write_body(json.dumps(payload).encode("utf-8"), status)
+
+    def _write_body(self, out: bytes, status: int = 200) -> None:
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
         self.send_header("Content-Length", str(len(out)))
@@ -161,25 +274,28 @@ class DashboardHandler(BaseHTTPRequestHandler):
 
     def do_GET(self):  # noqa: N802
         if self.path in ("/", "/index.html"):
-            out = HTML.encode("utf-8")
+            if self.headers.get("If-None-Match") == HTML_ETAG:
+                self.send_response(304)
+                self.send_header("ETag", HTML_ETAG)
+                self.end_headers()
+                return
             self.send_response(200)
             self.send_header("Content-Type", "text/html; charset=utf-8")
-            self.send_header("Content-Length", str(len(out)))
+            self.send_header("Content-Length", str(len(HTML_BYTES)))
+            self.send_header("ETag", HTML_ETAG)
             self.end_headers()
-            self.wfile.write(out)
+            self.wfile.write(HTML_BYTES)
             return
 
         if self.path == "/api/latest":
-            req = urllib.request.Request(f"{self.service_url}/bms/latest", method="GET")
             try:
-                with urllib.request.urlopen(req, timeout=2) as r:
-                    data = json.loads(r.read().decode("utf-8"))
-                self._write_json(data, 200)
-            except urllib.error.URLError as exc:
+                self._write_body(self.latest.get(self._fetch_latest), 200)
+            except (http.client.HTTPException, OSError) as exc:
                 self._write_json({"error": "service_unavailable", "details": str(exc)}, 503)
             return
 
         self.send_response(404)
+        self.send_header("Content-Length", "0")
         self.end_headers()
 
     def log_message(self, format, *args):  # noqa: A003
@@ -21,54 +21,150 @@ Notes:
 from __future__ import annotations
 
 import argparse
+import csv
 import json
 from pathlib import Path
-from typing import List
+from typing import Dict
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
 
-def _pick_column(columns: List[str], token: str) -> str:
-    token_lower = token.lower()
+
+def _lowered_columns(columns) -> Dict[str, str]:
+    """Map lowercase column name -> original, keeping the first on case-only clashes."""
+    lowered: Dict[str, str] = {}
     for col in columns:
-        if token_lower in col.lower():
+        lowered.setdefault(col.lower(), col)
+    return lowered
+
+
+def _pick_column(lowered: Dict[str, str], token: str) -> str:
+    token_lower = token.lower()
+    for col_lower, col in lowered.items():
+        if token_lower in col_lower:
             return col
     raise KeyError(f"Could not find column containing token: {token}")
 
 
-def _load_public_obd_csvs(input_dir: Path) -> pd.DataFrame:
+# Source signals, found by case-insensitive substring match on each file's header.
+_SOURCE_TOKENS = {
+    "vehicle_speed_kmh": "Vehicle Speed Sensor",
+    "ambient_temperature_c": "Ambient Air Temperature",
+    "map_kpa": "Intake Manifold Absolute Pressure",
+    "coolant_c": "Engine Coolant Temperature",
+    "pedal_pct": "Accelerator Pedal Position D",
+}
+
+
+def _read_source_columns(csv_path: Path) -> pa.Table:
+    """
+    Read just the mapped signals from one CSV, renamed to their _SOURCE_TOKENS keys.
+
+    Columns are read as strings: type inference is per file, so a stray
+    non-numeric token would otherwise make the same signal double in one file
+    and string in another. _numeric() coerces such tokens to NaN.
+    """
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        header = next(csv.reader(f), [])
+    lowered = _lowered_columns(header)
+    source = {name: _pick_column(lowered, token) for name, token in _SOURCE_TOKENS.items()}
+    table = pacsv.read_csv(
+        csv_path,
+        convert_options=pacsv.ConvertOptions(
+            include_columns=list(source.values()),
+            column_types={col: pa.string() for col in source.values()},
+        ),
+    )
+    return table.select(list(source.values())).rename_columns(list(source))
+
+
+def _load_public_obd_csvs(input_dir: Path) -> pa.Table:
     csv_files = sorted(input_dir.glob("*.csv"))
     if not csv_files:
         raise FileNotFoundError(f"No CSV files found in {input_dir}")
 
-    frames = []
-    for csv_path in csv_files:
-        df = pd.read_csv(csv_path)
-        frames.append(df)
+    # Every file yields the same string schema, so concat_tables only stitches
+    # chunk lists together; no merged copy is made.
+    return pa.concat_tables([_read_source_columns(csv_path) for csv_path in csv_files])
 
-    merged = pd.concat(frames, ignore_index=True)
-    return merged
 
+def _proxy_features(speed, ambient, map_kpa, coolant, pedal):
+    """
+    Engineer tire-pressure proxies from load/temperature/speed effects, plus a
+    bounded failure-score proxy. Baseline 32 psi with deterministic variations.
 
-def _build_autoforge_schema(raw: pd.DataFrame) -> pd.DataFrame:
-    cols = list(raw.columns)
+    Written with NumPy ufuncs only so it runs on whole arrays (fallback path)
+    or on scalars inside the fused Numba kernel.
+    """
+    speed_factor = (speed / 180.0) * 1.8
+    temp_factor = ((ambient - 20.0) / 40.0) * 1.0
+    map_factor = ((map_kpa - 100.0) / 60.0) * 0.8
+    coolant_factor = ((coolant - 90.0) / 50.0) * 0.4
+    pedal_factor = (pedal / 100.0) * 0.8
 
-    speed_col = _pick_column(cols, "Vehicle Speed Sensor")
-    ambient_col = _pick_column(cols, "Ambient Air Temperature")
-    map_col = _pick_column(cols, "Intake Manifold Absolute Pressure")
-    coolant_col = _pick_column(cols, "Engine Coolant Temperature")
-    pedal_col = _pick_column(cols, "Accelerator Pedal Position D")
+    base = 32.0 - speed_factor + temp_factor - map_factor - coolant_factor - pedal_factor
 
-    data = pd.DataFrame(
-        {
-            "vehicle_speed_kmh": pd.to_numeric(raw[speed_col], errors="coerce"),
-            "ambient_temperature_c": pd.to_numeric(raw[ambient_col], errors="coerce"),
-            "map_kpa": pd.to_numeric(raw[map_col], errors="coerce"),
-            "coolant_c": pd.to_numeric(raw[coolant_col], errors="coerce"),
-            "pedal_pct": pd.to_numeric(raw[pedal_col], errors="coerce"),
-        }
+    fl = np.minimum(np.maximum(base + 0.20, 24.0), 40.0)
+    fr = np.minimum(np.maximum(base - 0.10, 24.0), 40.0)
+    rl = np.minimum(np.maximum(base - 0.35, 24.0), 40.0)
+    rr = np.minimum(np.maximum(base - 0.25, 24.0), 40.0)
+
+    pressure_dev = (
+        np.abs(fl - 32.0) + np.abs(fr - 32.0) + np.abs(rl - 32.0) + np.abs(rr - 32.0)
+    ) / 4.0
+    speed_risk = speed / 180.0
+    temp_risk = np.abs(ambient - 22.0) / 40.0
+    failure = np.minimum(
+        np.maximum(0.14 * pressure_dev + 0.25 * speed_risk + 0.12 * temp_risk, 0.0), 1.0
     )
+    return fl, fr, rl, rr, failure
+
+
+if njit is not None:
+    _proxy_row = njit(_proxy_features)
+
+    @njit(parallel=True, cache=True)
+    def _proxy_kernel(speed, ambient, map_kpa, coolant, pedal, out):
+        # One fused pass per row: no per-step temporaries, rows split across cores.
+        for i in prange(speed.shape[0]):
+            fl, fr, rl, rr, failure = _proxy_row(
+                speed[i], ambient[i], map_kpa[i], coolant[i], pedal[i]
+            )
+            out[i, 0] = fl
+            out[i, 1] = fr
+            out[i, 2] = rl
+            out[i, 3] = rr
+            out[i, 4] = failure
+
+
+def _engineer(
+    speed: np.ndarray,
+    ambient: np.ndarray,
+    map_kpa: np.ndarray,
+    coolant: np.ndarray,
+    pedal: np.ndarray,
+) -> np.ndarray:
+    """Return an (n, 5) array of fl, fr, rl, rr, failure_score proxies."""
+    if njit is None:
+        return np.column_stack(_proxy_features(speed, ambient, map_kpa, coolant, pedal))
+    out = np.empty((speed.shape[0], 5), dtype=np.float64)
+    _proxy_kernel(speed, ambient, map_kpa, coolant, pedal, out)
+    return out
+
+
+def _numeric(raw: pa.Table, column: str) -> pd.Series:
+    return pd.to_numeric(raw.column(column).to_pandas(), errors="coerce")
+
+
+def _build_autoforge_schema(raw: pa.Table) -> pd.DataFrame:
+    data = pd.DataFrame({name: _numeric(raw, name) for name in _SOURCE_TOKENS})
 
     # Fill sparse telemetry gaps.
     data = data.interpolate(limit_direction="both")
@@ -76,39 +172,42 @@ def _build_autoforge_schema(raw: pd.DataFrame) -> pd.DataFrame:
     data = data.dropna()
 
     # Keep physically plausible range.
-    data = data[(data["vehicle_speed_kmh"] >= 0) & (data["vehicle_speed_kmh"] <= 220)]
-    data = data[(data["ambient_temperature_c"] >= -30) & (data["ambient_temperature_c"] <= 60)]
+    plausible = data["vehicle_speed_kmh"].between(0, 220) & data["ambient_temperature_c"].between(-30, 60)
+    data = data.loc[plausible]
 
-    # Engineer tire-pressure proxies from load/temperature/speed effects.
-    # Baseline 32 psi with deterministic variations.
-    speed_factor = (data["vehicle_speed_kmh"] / 180.0) * 1.8
-    temp_factor = ((data["ambient_temperature_c"] - 20.0) / 40.0) * 1.0
-    map_factor = ((data["map_kpa"] - 100.0) / 60.0) * 0.8
-    coolant_factor = ((data["coolant_c"] - 90.0) / 50.0) * 0.4
-    pedal_factor = (data["pedal_pct"] / 100.0) * 0.8
+    speed = data["vehicle_speed_kmh"].to_numpy(dtype=np.float64)
+    ambient = data["ambient_temperature_c"].to_numpy(dtype=np.float64)
+    engineered = _engineer(
+        speed,
+        ambient,
+        data["map_kpa"].to_numpy(dtype=np.float64),
+        data["coolant_c"].to_numpy(dtype=np.float64),
+        data["pedal_pct"].to_numpy(dtype=np.float64),
+    )
 
-    base = 32.0 - speed_factor + temp_factor - map_factor - coolant_factor - pedal_factor
+    return pd.DataFrame(
+        {
+            "tire_pressure_fl": engineered[:, 0],
+            "tire_pressure_fr": engineered[:, 1],
+            "tire_pressure_rl": engineered[:, 2],
+            "tire_pressure_rr": engineered[:, 3],
+            "vehicle_speed_kmh": speed,
+            "ambient_temperature_c": ambient,
+            "failure_score": engineered[:, 4],
+        }
+    )
 
-    out = pd.DataFrame()
-    out["tire_pressure_fl"] = np.clip(base + 0.20, 24.0, 40.0)
-    out["tire_pressure_fr"] = np.clip(base - 0.10, 24.0, 40.0)
-    out["tire_pressure_rl"] = np.clip(base - 0.35, 24.0, 40.0)
-    out["tire_pressure_rr"] = np.clip(base - 0.25, 24.0, 40.0)
-    out["vehicle_speed_kmh"] = data["vehicle_speed_kmh"].astype(float)
-    out["ambient_temperature_c"] = data["ambient_temperature_c"].astype(float)
 
-    # Engineer a bounded failure score proxy.
-    pressure_dev = (
-        np.abs(out["tire_pressure_fl"] - 32.0)
-        + np.abs(out["tire_pressure_fr"] - 32.0)
-        + np.abs(out["tire_pressure_rl"] - 32.0)
-        + np.abs(out["tire_pressure_rr"] - 32.0)
-    ) / 4.0
-    speed_risk = out["vehicle_speed_kmh"] / 180.0
-    temp_risk = np.abs(out["ambient_temperature_c"] - 22.0) / 40.0
-    out["failure_score"] = np.clip(0.14 * pressure_dev + 0.25 * speed_risk + 0.12 * temp_risk, 0.0, 1.0)
+def _cap_rows(frame: pd.DataFrame, max_rows: int) -> pd.DataFrame:
+    """
+    Keep `max_rows` rows spread evenly over the whole frame (0 keeps all).
 
-    return out.reset_index(drop=True)
+    Deterministic, order-preserving and O(n), with no shuffle-then-sort round trip.
+    """
+    n = len(frame)
+    if not max_rows or n <= max_rows:
+        return frame
+    return frame.iloc[(np.arange(max_rows) * n) // max_rows].reset_index(drop=True)
 
 
 def main() -> int:
@@ -143,8 +242,7 @@ def main() -> int:
     raw = _load_public_obd_csvs(input_dir)
     mapped = _build_autoforge_schema(raw)
     rows_before_cap = len(mapped)
-    if args.max_rows and len(mapped) > args.max_rows:
-        mapped = mapped.sample(n=args.max_rows, random_state=42).sort_index().reset_index(drop=True)
+    mapped = _cap_rows(mapped, args.max_rows)
 
     output_csv.parent.mkdir(parents=True, exist_ok=True)
     mapped.to_csv(output_csv, index=False)
@@ -16,23 +16,26 @@ is unavailable. It will:
 
 from __future__ import annotations
 
-import json
 import os
 import subprocess
 import sys
 import time
 import shutil
 from pathlib import Path
+from typing import Callable
 
 from dotenv import load_dotenv
 
+from _common import json_bytes, missing_paths, run_steps, widen_output_pipes
+
+
 ROOT = Path(__file__).resolve().parents[1]
 PY = sys.executable
 
 
 def run(cmd: list[str], env: dict[str, str] | None = None) -> None:
     print(f"[RUN] {' '.join(cmd)}")
-    subprocess.run(cmd, cwd=ROOT, env=env, check=True)
+    subprocess.run(cmd, cwd=ROOT, env=env, check=True, close_fds=True)
 
 
 def run_with_retries(
@@ -88,69 +91,96 @@ def ensure_replay_seed(path: Path) -> None:
         },
     ]
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(seed, indent=2))
+    # One raw write of the encoded payload; no buffered file object in between.
+    # O_BINARY keeps Windows from translating newlines.
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, 0o644)
+    try:
+        os.write(fd, json_bytes(seed))
+    finally:
+        os.close(fd)
 
 
 def main() -> int:
     load_dotenv(ROOT / ".env")
+    widen_output_pipes()
     env = os.environ.copy()
     env.setdefault("PYTHONIOENCODING", "utf-8")
     env.setdefault("PYTHONWARNINGS", "ignore::FutureWarning")
 
-    # 1) Public-data fallback CSV
-    run([PY, "scripts/prepare_public_vehicle_data.py"], env=env)
-
-    # 2) ML ONNX training from fallback CSV
-    run([PY, "src/ml/train.py", "--csv", "input/vehicle_data.csv", "--output", "models/tire_failure_bar.onnx"], env=env)
-    # Backward-compatible publish path for existing consumers.
-    shutil.copyfile(ROOT / "models" / "tire_failure_bar.onnx", ROOT / "models" / "tire_failure.onnx")
-    print("[ML] Published compatibility model: models/tire_failure.onnx")
-
-    # 3) SOME/IP config generator
-    run(
-        [
-            PY,
-            "src/codegen/protocol_adapter.py",
-            "--requirement",
-            "input/requirements/bms_diagnostic.yaml",
-            "--output",
-            "output/someip_service.json",
-        ],
-        env=env,
-    )
-
-    # 4) Core Ollama run
-    run([PY, "main.py", "--plain", "--demo", "bms", "--provider", "ollama"], env=env)
-
-    # 5) Optional Gemini run
+    def train_model() -> None:
+        # 2) ML ONNX training from fallback CSV
+        run([PY, "src/ml/train.py", "--csv", "input/vehicle_data.csv", "--output", "models/tire_failure_bar.onnx"], env=env)
+        # Backward-compatible publish path for existing consumers.
+        shutil.copyfile(ROOT / "models" / "tire_failure_bar.onnx", ROOT / "models" / "tire_failure.onnx")
+        print("[ML] Published compatibility model: models/tire_failure.onnx")
+
+    steps: dict[str, tuple[Callable[[], None], tuple[str, ...]]] = {
+        # 1) Public-data fallback CSV
+        "public_csv": (lambda: run([PY, "scripts/prepare_public_vehicle_data.py"], env=env), ()),
+        "train": (train_model, ("public_csv",)),
+        # 3) SOME/IP config generator
+        "someip": (
+            lambda: run(
+                [
+                    PY,
+                    "src/codegen/protocol_adapter.py",
+                    "--requirement",
+                    "input/requirements/bms_diagnostic.yaml",
+                    "--output",
+                    "output/someip_service.json",
+                ],
+                env=env,
+            ),
+            (),
+        ),
+        # 4) Core Ollama run
+        "core": (lambda: run([PY, "main.py", "--plain", "--demo", "bms", "--provider", "ollama"], env=env), ()),
+        # 6) Java + Kotlin runs (separate service dirs, so they overlap each other)
+        "java": (
+            lambda: run_with_retries(
+                [PY, "main.py", "--plain", "--requirement", "input/requirements/bms_diagnostic_java.yaml", "--provider", "ollama"],
+                env=env,
+                retries=2,
+                delay_seconds=5.0,
+                step_name="Java requirement run",
+            ),
+            ("core",),
+        ),
+        "kotlin": (
+            lambda: run_with_retries(
+                [PY, "main.py", "--plain", "--requirement", "input/requirements/bms_diagnostic_kotlin.yaml", "--provider", "ollama"],
+                env=env,
+                retries=2,
+                delay_seconds=5.0,
+                step_name="Kotlin requirement run",
+            ),
+            ("core",),
+        ),
+    }
+    # 5) Optional Gemini run; it rewrites the core run's service dir, so it follows it.
     if env.get("GOOGLE_API_KEY"):
-        run([PY, "main.py", "--plain", "--demo", "bms", "--provider", "gemini"], env=env)
+        steps["gemini"] = (
+            lambda: run([PY, "main.py", "--plain", "--demo", "bms", "--provider", "gemini"], env=env),
+            ("core",),
+        )
     else:
         print("[INFO] GOOGLE_API_KEY not set. Skipping Gemini run.")
 
-    # 6) Java + Kotlin runs
-    run_with_retries(
-        [PY, "main.py", "--plain", "--requirement", "input/requirements/bms_diagnostic_java.yaml", "--provider", "ollama"],
-        env=env,
-        retries=2,
-        delay_seconds=5.0,
-        step_name="Java requirement run",
-    )
-    run_with_retries(
-        [PY, "main.py", "--plain", "--requirement", "input/requirements/bms_diagnostic_kotlin.yaml", "--provider", "ollama"],
-        env=env,
-        retries=2,
-        delay_seconds=5.0,
-        step_name="Kotlin requirement run",
-    )
-
-    # 7) Replay mode with local REST stub
+    # 7) The REST stub needs nothing from steps 1-6, so it boots while they run.
     replay_seed = ROOT / "output" / "replay_seed.json"
     ensure_replay_seed(replay_seed)
 
-    stub = subprocess.Popen([PY, "integrations/service_stub/rest_bms_service.py"], cwd=ROOT, env=env)
+    stub = subprocess.Popen(
+        [PY, "integrations/service_stub/rest_bms_service.py"], cwd=ROOT, env=env, close_fds=True
+    )
+    stub_started = time.monotonic()
     try:
-        time.sleep(1.5)
+        # Steps 1-6 run as a dependency graph instead of strictly in sequence.
+        run_steps(steps)
+
+        # 7) Replay mode with local REST stub
+        time.sleep(max(0.0, 1.5 - (time.monotonic() - stub_started)))
         run(
             [
                 PY,
@@ -188,7 +218,7 @@ def main() -> int:
         ROOT / "output" / "BMSDiagnosticServiceKotlin" / "bmsdiagnosticservicekotlin.kt",
         ROOT / "output" / "BMSDiagnosticServiceKotlin" / "BMSDiagnosticServiceKotlin.java",
     ]
-    missing = [str(p) for p in required if not p.exists()]
+    missing = [str(p) for p in missing_paths(required)]
     if missing:
         print("[ERROR] Missing required artifacts:")
         for item in missing:
@@ -23,9 +23,12 @@ import sys
 import time
 import shutil
 from pathlib import Path
+from typing import Callable
 
 from dotenv import load_dotenv
 
+from _common import missing_paths, run_steps, widen_output_pipes
+
 ROOT = Path(__file__).resolve().parents[1]
 PY = sys.executable
 DEFAULT_CARLA_PY = ROOT / ".venv37" / "Scripts" / "python.exe"
@@ -33,7 +36,7 @@ DEFAULT_CARLA_PY = ROOT / ".venv37" / "Scripts" / "python.exe"
 
 def run(cmd: list[str], env: dict[str, str] | None = None) -> None:
     print(f"[RUN] {' '.join(cmd)}")
-    subprocess.run(cmd, cwd=ROOT, env=env, check=True)
+    subprocess.run(cmd, cwd=ROOT, env=env, check=True, close_fds=True)
 
 
 def run_with_retries(
@@ -74,6 +77,7 @@ def main() -> int:
     args = parser.parse_args()
 
     load_dotenv(ROOT / ".env")
+    widen_output_pipes()
     env = os.environ.copy()
     env.setdefault("PYTHONIOENCODING", "utf-8")
     env.setdefault("PYTHONWARNINGS", "ignore::FutureWarning")
@@ -84,58 +88,77 @@ def main() -> int:
         print("[HINT] Create .venv37 and install carla wheel for 0.9.13, then rerun.")
         return 1
 
-    # 1) Public-data fallback CSV for ML reproducibility
-    run([PY, "scripts/prepare_public_vehicle_data.py"], env=env)
-
-    # 2) ML ONNX training
-    run([PY, "src/ml/train.py", "--csv", "input/vehicle_data.csv", "--output", "models/tire_failure_bar.onnx"], env=env)
-    # Backward-compatible publish path for existing consumers.
-    shutil.copyfile(ROOT / "models" / "tire_failure_bar.onnx", ROOT / "models" / "tire_failure.onnx")
-    print("[ML] Published compatibility model: models/tire_failure.onnx")
-
-    # 3) SOME/IP config
-    run(
-        [
-            PY,
-            "src/codegen/protocol_adapter.py",
-            "--requirement",
-            "input/requirements/bms_diagnostic.yaml",
-            "--output",
-            "output/someip_service.json",
-        ],
-        env=env,
-    )
-
-    # 4) Core run
-    run([PY, "main.py", "--plain", "--demo", "bms", "--provider", args.provider], env=env)
-
-    # 5) Optional Gemini run
+    def train_model() -> None:
+        # 2) ML ONNX training
+        run([PY, "src/ml/train.py", "--csv", "input/vehicle_data.csv", "--output", "models/tire_failure_bar.onnx"], env=env)
+        # Backward-compatible publish path for existing consumers.
+        shutil.copyfile(ROOT / "models" / "tire_failure_bar.onnx", ROOT / "models" / "tire_failure.onnx")
+        print("[ML] Published compatibility model: models/tire_failure.onnx")
+
+    steps: dict[str, tuple[Callable[[], None], tuple[str, ...]]] = {
+        # 1) Public-data fallback CSV for ML reproducibility
+        "public_csv": (lambda: run([PY, "scripts/prepare_public_vehicle_data.py"], env=env), ()),
+        "train": (train_model, ("public_csv",)),
+        # 3) SOME/IP config
+        "someip": (
+            lambda: run(
+                [
+                    PY,
+                    "src/codegen/protocol_adapter.py",
+                    "--requirement",
+                    "input/requirements/bms_diagnostic.yaml",
+                    "--output",
+                    "output/someip_service.json",
+                ],
+                env=env,
+            ),
+            (),
+        ),
+        # 4) Core run
+        "core": (lambda: run([PY, "main.py", "--plain", "--demo", "bms", "--provider", args.provider], env=env), ()),
+        # 6) Java + Kotlin runs (separate service dirs, so they overlap each other)
+        "java": (
+            lambda: run_with_retries(
+                [PY, "main.py", "--plain", "--requirement", "input/requirements/bms_diagnostic_java.yaml", "--provider", args.provider],
+                env=env,
+                retries=2,
+                delay_seconds=5.0,
+                step_name="Java requirement run",
+            ),
+            ("core",),
+        ),
+        "kotlin": (
+            lambda: run_with_retries(
+                [PY, "main.py", "--plain", "--requirement", "input/requirements/bms_diagnostic_kotlin.yaml", "--provider", args.provider],
+                env=env,
+                retries=2,
+                delay_seconds=5.0,
+                step_name="Kotlin requirement run",
+            ),
+            ("core",),
+        ),
+    }
+    # 5) Optional Gemini run; it rewrites the core run's service dir, so it follows it.
     if not args.skip_gemini and env.get("GOOGLE_API_KEY"):
-        run([PY, "main.py", "--plain", "--demo", "bms", "--provider", "gemini"], env=env)
+        steps["gemini"] = (
+            lambda: run([PY, "main.py", "--plain", "--demo", "bms", "--provider", "gemini"], env=env),
+            ("core",),
+        )
     elif not args.skip_gemini:
         print("[INFO] GOOGLE_API_KEY not set. Skipping Gemini run.")
 
-    # 6) Java + Kotlin runs
-    run_with_retries(
-        [PY, "main.py", "--plain", "--requirement", "input/requirements/bms_diagnostic_java.yaml", "--provider", args.provider],
-        env=env,
-        retries=2,
-        delay_seconds=5.0,
-        step_name="Java requirement run",
+    # 7) The REST stub needs nothing from steps 1-6, so it boots while they run.
+    stub = subprocess.Popen(
+        [PY, "integrations/service_stub/rest_bms_service.py"], cwd=ROOT, env=env, close_fds=True
     )
-    run_with_retries(
-        [PY, "main.py", "--plain", "--requirement", "input/requirements/bms_diagnostic_kotlin.yaml", "--provider", args.provider],
-        env=env,
-        retries=2,
-        delay_seconds=5.0,
-        step_name="Kotlin requirement run",
-    )
-
-    # 7) Start local stub + optional dashboard + 8) run live CARLA bridge
-    stub = subprocess.Popen([PY, "integrations/service_stub/rest_bms_service.py"], cwd=ROOT, env=env)
+    stub_started = time.monotonic()
     dashboard = None
     try:
-        time.sleep(1.5)
+        # Steps 1-6 run as a dependency graph instead of strictly in sequence.
+        run_steps(steps)
+
+        # Optional dashboard + 8) run live CARLA bridge
+        time.sleep(max(0.0, 1.5 - (time.monotonic() - stub_started)))
         if args.with_hmi_dashboard:
             dashboard = subprocess.Popen(
                 [
@@ -150,6 +173,7 @@ def main() -> int:
                 ],
                 cwd=ROOT,
                 env=env,
+                close_fds=True,
             )
             time.sleep(0.7)
             print(f"[HMI] Open dashboard: http://{args.hmi_host}:{args.hmi_port}")
@@ -198,7 +222,7 @@ def main() -> int:
         ROOT / "output" / "BMSDiagnosticServiceKotlin" / "bmsdiagnosticservicekotlin.kt",
         ROOT / "output" / "BMSDiagnosticServiceKotlin" / "BMSDiagnosticServiceKotlin.java",
     ]
-    missing = [str(p) for p in required if not p.exists()]
+    missing = [str(p) for p in missing_paths(required)]
     if missing:
         print("[ERROR] Missing required artifacts:")
         for item in missing:
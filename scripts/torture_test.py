@@ -14,18 +14,20 @@ Outputs:
 from __future__ import annotations
 
 import argparse
-import json
 import os
 import random
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List
 
+
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT / "src"))
 
+from _common import json_bytes, missing_paths, write_json_streaming  # noqa: E402
 from pipeline.orchestrator import Pipeline  # noqa: E402
 
 
@@ -37,7 +39,18 @@ DEFAULT_REQUIREMENTS = [
 ]
 
 
-def _build_run_plan(requirements: List[str], total_runs: int, seed: int) -> List[str]:
+def _build_run_plan(
+    requirements: List[str], total_runs: int, seed: int, shuffle: bool = True
+) -> List[str]:
+    if not shuffle:
+        # Same per-requirement counts as the cyclic plan, but grouped so
+        # consecutive runs hit the same requirement and its warm caches.
+        per_req, extra = divmod(total_runs, len(requirements))
+        return [
+            req
+            for i, req in enumerate(requirements)
+            for _ in range(per_req + (1 if i < extra else 0))
+        ]
     rng = random.Random(seed)
     plan = []
     for i in range(total_runs):
@@ -46,6 +59,29 @@ def _build_run_plan(requirements: List[str], total_runs: int, seed: int) -> List
     return plan
 
 
+def _run_pipeline(pipeline: Pipeline, idx: int, req: str) -> Dict:
+    t0 = time.monotonic()
+    result = pipeline.run(str(ROOT / req))
+    t1 = time.monotonic()
+
+    return {
+        "run_index": idx,
+        "requirement": req,
+        "provider": pipeline.llm_provider,
+        "success": bool(result.success),
+        "retry_count": int(result.retry_count),
+        "duration_sec": round(t1 - t0, 3),
+        "trace_id": result.trace_id,
+        "timestamp": result.timestamp,
+        "errors": list(result.errors),
+    }
+
+
+def _execute_run(idx: int, req: str, provider: str, output_dir: str) -> Dict:
+    """Run one plan entry; module-level so ProcessPoolExecutor can pickle it."""
+    return _run_pipeline(Pipeline(llm_provider=provider, output_dir=output_dir), idx, req)
+
+
 def _safe_rate(n: int, d: int) -> float:
     return round((n / d) * 100.0, 2) if d else 0.0
 
@@ -60,43 +96,65 @@ def main() -> int:
         help="Comma-separated requirement YAML paths",
     )
     parser.add_argument("--seed", type=int, default=42, help="Shuffle seed for run order")
+    parser.add_argument(
+        "--no-shuffle",
+        action="store_true",
+        help="Keep runs grouped by requirement instead of shuffling (warm-cache batches)",
+    )
     parser.add_argument("--output", default="evidence/torture_log.json", help="Output log JSON path")
     parser.add_argument("--output-dir", default="output", help="Pipeline output directory")
+    parser.add_argument(
+        "--streaming-json",
+        action="store_true",
+        help="Stream the report's runs list to disk item by item (compact lines)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Parallel worker processes; each run then writes under <output-dir>/w<run>",
+    )
     args = parser.parse_args()
 
     requirements = [x.strip() for x in args.requirements.split(",") if x.strip()]
-    missing = [r for r in requirements if not (ROOT / r).exists()]
+    absent = set(missing_paths(ROOT / r for r in requirements))
+    missing = [r for r in requirements if ROOT / r in absent]
     if missing:
         raise FileNotFoundError(f"Missing requirement files: {missing}")
 
+    # Create the log directory up front so a bad --output fails before any run.
+    out_path = ROOT / args.output
+    os.makedirs(out_path.parent, exist_ok=True)
+
     os.environ.setdefault("PYTHONIOENCODING", "utf-8")
     os.environ.setdefault("PYTHONWARNINGS", "ignore::FutureWarning")
 
-    plan = _build_run_plan(requirements, args.runs, args.seed)
+    plan = _build_run_plan(requirements, args.runs, args.seed, shuffle=not args.no_shuffle)
     runs: List[Dict] = []
 
-    started = time.time()
-    for idx, req in enumerate(plan, start=1):
-        print(f"[TORTURE] Run {idx}/{args.runs} | provider={args.provider} | requirement={req}")
+    started = time.monotonic()
+    if args.workers <= 1:
+        # Pipeline.run keeps no per-run instance state, so the agents and
+        # clients built in __init__ are shared by every run.
         pipeline = Pipeline(llm_provider=args.provider, output_dir=args.output_dir)
-        t0 = time.time()
-        result = pipeline.run(str(ROOT / req))
-        t1 = time.time()
-
-        run_item = {
-            "run_index": idx,
-            "requirement": req,
-            "provider": args.provider,
-            "success": bool(result.success),
-            "retry_count": int(result.retry_count),
-            "duration_sec": round(t1 - t0, 3),
-            "trace_id": result.trace_id,
-            "timestamp": result.timestamp,
-            "errors": list(result.errors),
-        }
-        runs.append(run_item)
-
-    ended = time.time()
+        for idx, req in enumerate(plan, start=1):
+            print(f"[TORTURE] Run {idx}/{args.runs} | provider={args.provider} | requirement={req}")
+            runs.append(_run_pipeline(pipeline, idx, req))
+    else:
+        # Runs are independent and LLM/I/O bound; per-run output dirs keep
+        # concurrent pipelines from clobbering each other's service folders.
+        with ProcessPoolExecutor(max_workers=args.workers) as ex:
+            futures = []
+            for idx, req in enumerate(plan, start=1):
+                print(f"[TORTURE] Submit {idx}/{args.runs} | provider={args.provider} | requirement={req}")
+                futures.append(
+                    ex.submit(_execute_run, idx, req, args.provider, f"{args.output_dir}/w{idx}")
+                )
+            for future in as_completed(futures):
+                runs.append(future.result())
+        runs.sort(key=lambda r: r["run_index"])
+
+    ended = time.monotonic()
     success_count = sum(1 for r in runs if r["success"])
     fail_count = len(runs) - success_count
     avg_duration = round(sum(r["duration_sec"] for r in runs) / len(runs), 3) if runs else 0.0
@@ -121,6 +179,8 @@ def main() -> int:
             "provider": args.provider,
             "runs": args.runs,
             "seed": args.seed,
+            "shuffled": not args.no_shuffle,
+            "workers": args.workers,
             "requirements": requirements,
             "total_wall_time_sec": round(ended - started, 3),
         },
@@ -135,9 +195,11 @@ def main() -> int:
         "runs": runs,
     }
 
-    out_path = ROOT / args.output
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.streaming_json:
+        head = {k: v for k, v in report.items() if k != "runs"}
+        write_json_streaming(out_path, head, "runs", runs)
+    else:
+        out_path.write_bytes(json_bytes(report))
 
     print("\n[TORTURE] Completed")
     print(f"[TORTURE] Output: {out_path}")
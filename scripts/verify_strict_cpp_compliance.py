@@ -7,14 +7,15 @@ This provides a deterministic evidence artifact for compliance tooling readiness
 
 from __future__ import annotations
 
-import json
 import os
 import sys
 from pathlib import Path
 
+
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT / "src"))
 
+from _common import json_bytes  # noqa: E402
 from pipeline.validation_gate import get_validation_gate  # noqa: E402
 
 
@@ -132,7 +133,7 @@ def main() -> int:
 
     out_path = ROOT / "output" / "strict_cpp_compliance_report.json"
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(out, indent=2))
+    out_path.write_bytes(json_bytes(out))
 
     print(f"[STRICT] Report written: {out_path}")
     print(f"[STRICT] valid={out.get('passed')}")
@@ -3,17 +3,61 @@ AUTOFORGE Code Generators
 Generates automotive service code for multiple languages.
 """
 
+import asyncio
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import partial
 from typing import Dict, Any, Optional
 import yaml
 
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _YamlDumper
+
+from codegen.line_count import count_non_blank_lines
 from llm.client import get_client, LLMClient
 from llm.prompts import (
-    CPP_SOMEIP_TEMPLATE,
-    RUST_SOMEIP_TEMPLATE,
-    VALIDATION_PROMPT,
+    CPP_SERVICE_TMPL,
+    JAVA_SERVICE_TMPL,
+    KOTLIN_SERVICE_TMPL,
+    RUST_SERVICE_TMPL,
+    VALIDATION_TMPL,
+    PromptTemplate,
 )
 
 
+def _format_someip_id(value: Any) -> str:
+    """
+    Render a SOME/IP ID as 0x-prefixed hex.
+
+    YAML loads `service_id: 0x1001` as the int 4097, which str() would put into
+    the prompt as decimal. Anything that is not a non-negative integer (or an
+    integer literal string) is passed through str() unchanged.
+    """
+    if isinstance(value, str):
+        try:
+            parsed = int(value, 0)
+        except ValueError:
+            return value
+        return f"0x{parsed:04x}" if parsed >= 0 else value
+    if isinstance(value, int) and not isinstance(value, bool) and value >= 0:
+        return f"0x{value:04x}"
+    return str(value)
+
+
+def _dump_yaml(data: Any) -> str:
+    """Serialize prompt fragments with the C-backed dumper (same output as yaml.dump).
+
+    Empty fragments (no methods/events) become "" without invoking the dumper.
+    """
+    if not data:
+        return ""
+    return yaml.dump(data, Dumper=_YamlDumper, default_flow_style=False)
+
+
 class BaseCodeGenerator:
     """Base class for all code generators."""
 
@@ -29,13 +73,28 @@ class BaseCodeGenerator:
         test_code: str
     ) -> str:
         """Generate service implementation from requirement and tests."""
+        raw_code = self.llm.generate(self._build_prompt(requirement, test_code))
+        self._enforce_min_lines(raw_code)
+        return raw_code
+
+    async def agenerate_service(
+        self,
+        requirement: Dict[str, Any],
+        test_code: str
+    ) -> str:
+        """Async generate_service(); awaits the LLM instead of blocking on it."""
+        raw_code = await self.llm.agenerate(self._build_prompt(requirement, test_code))
+        self._enforce_min_lines(raw_code)
+        return raw_code
+
+    def _build_prompt(self, requirement: Dict[str, Any], test_code: str) -> str:
+        """Build the language-specific generation prompt."""
         raise NotImplementedError
 
     def validate_code(self, code: str) -> Dict[str, Any]:
         """Validate generated code for syntax and compliance."""
-        prompt = VALIDATION_PROMPT.format(code=code, language=self.language)
+        prompt = VALIDATION_TMPL.substitute(code=code, language=self.language)
         response = self.llm.generate(prompt)
-        import json
         try:
             return json.loads(response)
         except json.JSONDecodeError:
@@ -43,7 +102,7 @@ class BaseCodeGenerator:
 
     def _enforce_min_lines(self, code: str) -> None:
         """Enforce minimum service size for production readiness."""
-        line_count = sum(1 for line in code.splitlines() if line.strip())
+        line_count = count_non_blank_lines(code)
         if line_count < self.min_service_lines:
             raise ValueError(
                 f"{self.language} service too short: {line_count} lines "
@@ -59,9 +118,9 @@ class BaseCodeGenerator:
 
     def _service_ids(self, requirement: Dict[str, Any]) -> tuple[str, str]:
         interface = requirement.get("service", {}).get("interface", {})
-        service_id = interface.get("service_id", requirement.get("service_id", "0x1234"))
-        instance_id = interface.get("instance_id", requirement.get("instance_id", "0x5678"))
-        return str(service_id), str(instance_id)
+        service_id = interface.get("service_id", requirement.get("service_id", 0x1234))
+        instance_id = interface.get("instance_id", requirement.get("instance_id", 0x5678))
+        return _format_someip_id(service_id), _format_someip_id(instance_id)
 
     def _methods(self, requirement: Dict[str, Any]) -> list:
         return (
@@ -76,188 +135,113 @@ class BaseCodeGenerator:
         )
 
 
-class CppGenerator(BaseCodeGenerator):
-    """C++ SOME/IP code generator."""
-
-    def __init__(self, llm_client: Optional[LLMClient] = None):
-        super().__init__(llm_client)
-        self.language = "C++"
-        self.file_extension = ".cpp"
-
-    def generate_service(
-        self,
-        requirement: Dict[str, Any],
-        test_code: str
-    ) -> str:
-        service_name = self._service_name(requirement)
-        service_id, instance_id = self._service_ids(requirement)
-        methods_yaml = yaml.dump(self._methods(requirement))
-        events_yaml = yaml.dump(self._events(requirement))
-
-        prompt = CPP_SOMEIP_TEMPLATE.format(
-            service_name=service_name,
-            service_id=service_id,
-            instance_id=instance_id,
-            methods_yaml=methods_yaml,
-            events_yaml=events_yaml,
-        )
-
-        full_prompt = f"""
-{prompt}
-
-IMPORTANT: The implementation MUST pass these tests:
-```cpp
-{test_code}
-```
-"""
-
-        raw_code = self.llm.generate(full_prompt)
-        self._enforce_min_lines(raw_code)
-        return raw_code
-
-
-class KotlinGenerator(BaseCodeGenerator):
-    """Kotlin code generator for Android Automotive services."""
-
-    def __init__(self, llm_client: Optional[LLMClient] = None):
-        super().__init__(llm_client)
-        self.language = "Kotlin"
-        self.file_extension = ".kt"
-
-    def generate_service(
-        self,
-        requirement: Dict[str, Any],
-        test_code: str
-    ) -> str:
-        service_name = self._service_name(requirement)
-        methods_yaml = yaml.dump(self._methods(requirement))
-
-        prompt = f"""
-Generate a Kotlin service for Android Automotive:
-
-SERVICE: {service_name}
-
-METHODS:
-{methods_yaml}
+@dataclass(frozen=True)
+class GeneratorSpec:
+    """Everything that distinguishes one language's generator from another."""
+    language: str
+    file_extension: str
+    template: PromptTemplate
+    needs_ids: bool
+    needs_events: bool
 
-Requirements:
-1. Use Kotlin coroutines for async operations
-2. Follow Android Automotive patterns
-3. Include proper null safety
-4. Use data classes for DTOs
-5. Minimum 200 non-empty lines
 
-The implementation MUST pass these tests:
-```kotlin
-{test_code}
-```
+GENERATOR_SPECS: Dict[str, GeneratorSpec] = {
+    "cpp": GeneratorSpec("C++", ".cpp", CPP_SERVICE_TMPL, needs_ids=True, needs_events=True),
+    "rust": GeneratorSpec("Rust", ".rs", RUST_SERVICE_TMPL, needs_ids=True, needs_events=False),
+    "kotlin": GeneratorSpec("Kotlin", ".kt", KOTLIN_SERVICE_TMPL, needs_ids=False, needs_events=False),
+    "java": GeneratorSpec("Java", ".java", JAVA_SERVICE_TMPL, needs_ids=False, needs_events=False),
+}
 
-Output ONLY Kotlin code.
-"""
-        raw_code = self.llm.generate(prompt)
-        self._enforce_min_lines(raw_code)
-        return raw_code
+_LANGUAGE_ALIASES = {
+    "c++": "cpp",
+    "rs": "rust",
+    "kt": "kotlin",
+    "jav": "java",
+}
 
 
-class JavaGenerator(BaseCodeGenerator):
-    """Java code generator for Android Automotive services."""
+class TemplatedGenerator(BaseCodeGenerator):
+    """Code generator for any language described by a GeneratorSpec."""
 
-    def __init__(self, llm_client: Optional[LLMClient] = None):
+    def __init__(self, spec: GeneratorSpec, llm_client: Optional[LLMClient] = None):
         super().__init__(llm_client)
-        self.language = "Java"
-        self.file_extension = ".java"
-
-    def generate_service(
-        self,
-        requirement: Dict[str, Any],
-        test_code: str
-    ) -> str:
-        service_name = self._service_name(requirement)
-        methods_yaml = yaml.dump(self._methods(requirement))
-
-        prompt = f"""
-Generate a Java service for Android Automotive:
-
-SERVICE: {service_name}
-
-METHODS:
-{methods_yaml}
-
-Requirements:
-1. Use Java 17 compatible code
-2. Follow Android Automotive service patterns
-3. Include defensive coding and null checks
-4. Use POJOs for DTOs
-5. Minimum 200 non-empty lines
-
-The implementation MUST pass these tests:
-```java
-{test_code}
-```
-
-Output ONLY Java code.
-"""
-        raw_code = self.llm.generate(prompt)
-        self._enforce_min_lines(raw_code)
-        return raw_code
-
-
-class RustGenerator(BaseCodeGenerator):
-    """Rust SOME/IP code generator."""
-
-    def __init__(self, llm_client: Optional[LLMClient] = None):
-        super().__init__(llm_client)
-        self.language = "Rust"
-        self.file_extension = ".rs"
-
-    def generate_service(
-        self,
-        requirement: Dict[str, Any],
-        test_code: str
-    ) -> str:
-        service_name = self._service_name(requirement)
-        service_id, instance_id = self._service_ids(requirement)
-        methods_yaml = yaml.dump(self._methods(requirement))
-        events_yaml = yaml.dump(self._events(requirement))
-
-        prompt = RUST_SOMEIP_TEMPLATE.format(
-            service_name=service_name,
-            service_id=service_id,
-            instance_id=instance_id,
-            methods_yaml=methods_yaml,
-            events_yaml=events_yaml,
-        )
-
-        full_prompt = f"""
-{prompt}
-
-IMPORTANT: The implementation MUST pass these tests:
-```rust
-{test_code}
-```
-"""
-
-        raw_code = self.llm.generate(full_prompt)
-        self._enforce_min_lines(raw_code)
-        return raw_code
+        self.spec = spec
+        self.language = spec.language
+        self.file_extension = spec.file_extension
+
+    def _build_prompt(self, requirement: Dict[str, Any], test_code: str) -> str:
+        values = {
+            "service_name": self._service_name(requirement),
+            "methods_yaml": _dump_yaml(self._methods(requirement)),
+            "test_code": test_code,
+        }
+        if self.spec.needs_ids:
+            values["service_id"], values["instance_id"] = self._service_ids(requirement)
+        if self.spec.needs_events:
+            values["events_yaml"] = _dump_yaml(self._events(requirement))
+        return self.spec.template.substitute(**values)
+
+
+# The per-language classes these replaced; kept so CppGenerator(llm_client)
+# and friends still construct the equivalent generator.
+CppGenerator = partial(TemplatedGenerator, GENERATOR_SPECS["cpp"])
+RustGenerator = partial(TemplatedGenerator, GENERATOR_SPECS["rust"])
+KotlinGenerator = partial(TemplatedGenerator, GENERATOR_SPECS["kotlin"])
+JavaGenerator = partial(TemplatedGenerator, GENERATOR_SPECS["java"])
+
+
+def _spec_key(language: str) -> str:
+    key = language.lower()
+    key = _LANGUAGE_ALIASES.get(key, key)
+    if key not in GENERATOR_SPECS:
+        raise ValueError(f"Unsupported language: {language}")
+    return key
 
 
 def get_generator(language: str, llm_client: Optional[LLMClient] = None) -> BaseCodeGenerator:
     """Get a code generator for the specified language."""
-    generators = {
-        "cpp": CppGenerator,
-        "c++": CppGenerator,
-        "kotlin": KotlinGenerator,
-        "kt": KotlinGenerator,
-        "java": JavaGenerator,
-        "jav": JavaGenerator,
-        "rust": RustGenerator,
-        "rs": RustGenerator,
-    }
-
-    generator_class = generators.get(language.lower())
-    if generator_class is None:
-        raise ValueError(f"Unsupported language: {language}")
-
-    return generator_class(llm_client)
-
+    return TemplatedGenerator(GENERATOR_SPECS[_spec_key(language)], llm_client)
+
+
+# Generators keep no per-call state, so loops over many requirements can share
+# one per (language, client) instead of allocating one per requirement. Bounded
+# LRU: at most this many generators (and the clients they hold) stay alive.
+_GENERATOR_CACHE_SIZE = 16
+_generator_cache: "OrderedDict[tuple, TemplatedGenerator]" = OrderedDict()
+_generator_lock = threading.Lock()
+
+
+def get_cached_generator(language: str, llm_client: Optional[LLMClient] = None) -> BaseCodeGenerator:
+    """get_generator(), reusing one shared instance per (language, llm_client) pair."""
+    key = (_spec_key(language), id(llm_client))
+    with _generator_lock:
+        generator = _generator_cache.get(key)
+        # The identity check guards against id() reuse after a client is freed.
+        if generator is not None and (llm_client is None or generator.llm is llm_client):
+            _generator_cache.move_to_end(key)
+            return generator
+        generator = _generator_cache[key] = TemplatedGenerator(GENERATOR_SPECS[key[0]], llm_client)
+        if len(_generator_cache) > _GENERATOR_CACHE_SIZE:
+            _generator_cache.popitem(last=False)
+        return generator
+
+
+async def generate_all_languages(
+    requirement: Dict[str, Any],
+    tests: Dict[str, str],
+    llm_client: Optional[LLMClient] = None,
+) -> Dict[str, str]:
+    """
+    Generate one service per language in `tests` (language -> test code) concurrently.
+
+    All LLM round-trips are awaited together, so the fan-out costs roughly the
+    slowest single generation rather than their sum.
+    """
+    languages = list(tests)
+    results = await asyncio.gather(
+        *(
+            get_cached_generator(language, llm_client).agenerate_service(requirement, tests[language])
+            for language in languages
+        )
+    )
+    return dict(zip(languages, results))
@@ -0,0 +1,28 @@
+"""
+JSON encoding for generated artifacts and script reports.
+
+orjson is used when installed; the stdlib fallback produces the same layout.
+Kept free of project imports so protocol_adapter.py (run as a script) and the
+helpers in scripts/ can both load it.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_bytes(payload: object) -> bytes:
+    """Indented (2-space) UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    return json.dumps(payload, indent=2).encode("utf-8")
+
+
+def json_item(payload: object) -> bytes:
+    """Compact UTF-8 JSON for a single value."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
@@ -0,0 +1,14 @@
+"""
+Non-blank line counting shared by the code generators and the validation gate.
+"""
+
+import re
+
+# A line counts when it holds any non-whitespace character (line.strip() is truthy).
+# Compiled once at import; each count is then a single C-level scan.
+_NON_BLANK_LINE = re.compile(r"^[^\S\n]*\S", re.MULTILINE)
+
+
+def count_non_blank_lines(code: str) -> int:
+    """Number of lines in `code` that are not empty or whitespace-only."""
+    return len(_NON_BLANK_LINE.findall(code))
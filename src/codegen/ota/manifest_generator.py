@@ -3,12 +3,135 @@ OTA Manifest Generator for AUTOFORGE
 Auto-generates Over-The-Air update manifests for fleet deployment.
 """
 
+import os
+import sys
 import yaml
 import json
-from typing import Dict, List, Any
-from datetime import datetime
+from typing import Dict, List, Any, Optional
+from datetime import datetime, timezone
 from pathlib import Path
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from yaml import CSafeDumper as _YamlDumper, CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _YamlDumper, SafeLoader as _YamlLoader
+
+try:
+    from codegen.json_io import json_bytes, json_item
+except ImportError:  # run as a script: python src/codegen/ota/manifest_generator.py
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from codegen.json_io import json_bytes, json_item
+
+# Read size for the pre-3.11 checksum fallback; artifacts can be multi-MB binaries.
+_CHECKSUM_READ_SIZE = 1 << 20
+# Fleet manifests are written through a 1 MiB buffer.
+_YAML_WRITE_BUFFER = 1 << 20
+# "yaml" (default) or "json": the one format variant configs are written in.
+VARIANT_FORMAT_ENV = "AUTOFORGE_VARIANT_FORMAT"
+# "yaml" (default) or "json": the one format ota_manifest.<fmt> is written in.
+MANIFEST_FORMAT_ENV = "AUTOFORGE_OTA_MANIFEST_FORMAT"
+
+
+# The rollout/dependency blocks go into the manifest returned to callers, so
+# each call builds fresh dicts/lists: editing one manifest never leaks into
+# the next.
+
+def _rollout_config(strategy: str) -> Dict[str, Any]:
+    """Get rollout configuration based on strategy."""
+    configs = {
+        "immediate": {
+            "target_percentage": 100,
+            "rollout_phases": [
+                {"phase": 1, "percentage": 100, "duration_hours": 0}
+            ]
+        },
+        "gradual": {
+            "target_percentage": 100,
+            "rollout_phases": [
+                {"phase": 1, "percentage": 10, "duration_hours": 24},
+                {"phase": 2, "percentage": 50, "duration_hours": 48},
+                {"phase": 3, "percentage": 100, "duration_hours": 72}
+            ]
+        },
+        "canary": {
+            "target_percentage": 100,
+            "rollout_phases": [
+                {"phase": 1, "percentage": 1, "duration_hours": 48},
+                {"phase": 2, "percentage": 10, "duration_hours": 72},
+                {"phase": 3, "percentage": 100, "duration_hours": 96}
+            ]
+        }
+    }
+    if strategy not in configs:
+        return _rollout_config("gradual")
+    return configs[strategy]
+
+
+def _dependencies(is_bms: bool) -> List[Dict[str, Any]]:
+    """Generate service dependencies."""
+    # Common automotive dependencies
+    base_deps = [
+        {"name": "vsomeip", "version": ">=3.4.0", "required": True},
+        {"name": "onnxruntime", "version": ">=1.16.0", "required": False},
+    ]
+
+    # Service-specific deps
+    if is_bms:
+        base_deps.append({
+            "name": "battery-manager",
+            "version": ">=2.0.0",
+            "required": True
+        })
+
+    return base_deps
+
+
+# Per-variant feature flags and signal lists for generate_variant_configs().
+# _build_variant() copies them into each returned config.
+_EV_FEATURES = {
+    "battery_monitoring": True,
+    "regenerative_braking": True,
+    "range_estimation": True,
+    "fast_charging": True,
+}
+_EV_SIGNALS = [
+    "battery_soc", "battery_voltage", "battery_current",
+    "battery_temperature", "motor_temperature", "motor_torque"
+]
+
+_HYBRID_FEATURES = {
+    "battery_monitoring": True,
+    "regenerative_braking": True,
+    "range_estimation": True,
+    "fast_charging": False,
+    "engine_integration": True,
+}
+_HYBRID_SIGNALS = [
+    "battery_soc", "battery_voltage", "engine_rpm",
+    "fuel_level", "motor_temperature"
+]
+
+_ICE_FEATURES = {
+    "battery_monitoring": False,  # Only 12V battery
+    "regenerative_braking": False,
+    "range_estimation": False,
+    "engine_integration": True,
+}
+_ICE_SIGNALS = [
+    "engine_rpm", "fuel_level", "engine_temperature",
+    "oil_pressure", "coolant_temperature"
+]
+
+
+def _build_variant(
+    base_config: Dict[str, Any],
+    variant: str,
+    features: Dict[str, bool],
+    signals: List[str],
+) -> Dict[str, Any]:
+    return dict(base_config, variant=variant, features=dict(features), signals=list(signals))
 
 
 class OTAManifestGenerator:
@@ -42,29 +165,31 @@ class OTAManifestGenerator:
         Returns:
             OTA manifest dictionary
         """
+        # One timestamp covers the service block and its signature.
+        timestamp = datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
         manifest = {
             "ota_update": {
                 "manifest_version": self.manifest_version,
                 "service": {
                     "name": service_name,
                     "version": version,
-                    "timestamp": datetime.utcnow().isoformat() + "Z",
+                    "timestamp": timestamp,
                 },
                 "artifacts": self._process_artifacts(artifacts),
                 "deployment": {
                     "vehicle_variants": variants,
                     "rollout_strategy": rollout_strategy,
-                    "rollout_config": self._get_rollout_config(rollout_strategy),
+                    "rollout_config": _rollout_config(rollout_strategy),
                 },
                 "subscription": self._get_subscription_block(service_name, subscription_tier),
-                "dependencies": self._generate_dependencies(service_name),
+                "dependencies": _dependencies("bms" in service_name.lower()),
                 "safety": {
                     "require_parking": True,
                     "require_battery_level": 30,  # Minimum 30% SOC
                     "rollback_enabled": True,
                     "validation_required": True,
                 },
-                "signature": self._generate_signature(service_name, version, artifacts)
+                "signature": self._generate_signature(service_name, version, artifacts, timestamp)
             }
         }
         
@@ -72,85 +197,42 @@ class OTAManifestGenerator:
     
     def _process_artifacts(self, artifacts: Dict[str, Path]) -> List[Dict[str, Any]]:
         """Process artifacts and generate metadata."""
-        processed = []
-        
-        for artifact_type, filepath in artifacts.items():
-            if not filepath.exists():
-                continue
-            
-            # Calculate checksum
-            checksum = self._calculate_checksum(filepath)
-            
-            artifact_info = {
-                "type": artifact_type,
-                "filename": filepath.name,
-                "size_bytes": filepath.stat().st_size,
-                "checksum": {
-                    "algorithm": "sha256",
-                    "value": checksum
-                },
-                "compression": "gzip" if artifact_type in ["binary", "library"] else "none",
-            }
-            
-            processed.append(artifact_info)
-        
-        return processed
+        if not artifacts:
+            return []
+        # hashlib releases the GIL while hashing, so artifacts are checksummed
+        # concurrently; map() keeps the manifest in the caller's artifact order.
+        with ThreadPoolExecutor(max_workers=min(8, len(artifacts))) as ex:
+            results = ex.map(self._artifact_meta, artifacts.keys(), artifacts.values())
+            return [info for info in results if info is not None]
+
+    def _artifact_meta(self, artifact_type: str, filepath: Path) -> Optional[Dict[str, Any]]:
+        """Build metadata for one artifact, or None when the file is missing."""
+        try:
+            size_bytes = filepath.stat().st_size
+        except FileNotFoundError:
+            return None
+
+        return {
+            "type": artifact_type,
+            "filename": filepath.name,
+            "size_bytes": size_bytes,
+            "checksum": {
+                "algorithm": "sha256",
+                "value": self._calculate_checksum(filepath)
+            },
+            "compression": "gzip" if artifact_type in ["binary", "library"] else "none",
+        }
     
     def _calculate_checksum(self, filepath: Path) -> str:
         """Calculate SHA256 checksum of file."""
-        sha256 = hashlib.sha256()
         with open(filepath, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b""):
+            if hasattr(hashlib, "file_digest"):  # Python 3.11+: read/update loop runs in C
+                return hashlib.file_digest(f, "sha256").hexdigest()
+            sha256 = hashlib.sha256()
+            while chunk := f.read(_CHECKSUM_READ_SIZE):
                 sha256.update(chunk)
         return sha256.hexdigest()
     
-    def _get_rollout_config(self, strategy: str) -> Dict[str, Any]:
-        """Get rollout configuration based on strategy."""
-        configs = {
-            "immediate": {
-                "target_percentage": 100,
-                "rollout_phases": [
-                    {"phase": 1, "percentage": 100, "duration_hours": 0}
-                ]
-            },
-            "gradual": {
-                "target_percentage": 100,
-                "rollout_phases": [
-                    {"phase": 1, "percentage": 10, "duration_hours": 24},
-                    {"phase": 2, "percentage": 50, "duration_hours": 48},
-                    {"phase": 3, "percentage": 100, "duration_hours": 72}
-                ]
-            },
-            "canary": {
-                "target_percentage": 100,
-                "rollout_phases": [
-                    {"phase": 1, "percentage": 1, "duration_hours": 48},
-                    {"phase": 2, "percentage": 10, "duration_hours": 72},
-                    {"phase": 3, "percentage": 100, "duration_hours": 96}
-                ]
-            }
-        }
-        
-        return configs.get(strategy, configs["gradual"])
-    
-    def _generate_dependencies(self, service_name: str) -> List[Dict[str, str]]:
-        """Generate service dependencies."""
-        # Common automotive dependencies
-        base_deps = [
-            {"name": "vsomeip", "version": ">=3.4.0", "required": True},
-            {"name": "onnxruntime", "version": ">=1.16.0", "required": False},
-        ]
-        
-        # Service-specific deps
-        if "bms" in service_name.lower():
-            base_deps.append({
-                "name": "battery-manager",
-                "version": ">=2.0.0",
-                "required": True
-            })
-        
-        return base_deps
-
     def _get_subscription_block(self, service_name: str, tier: str) -> Dict[str, Any]:
         """Load subscription tier configuration and return manifest block."""
         config_path = Path(__file__).resolve().parents[2] / "config" / "subscription_config.yaml"
@@ -162,7 +244,7 @@ class OTAManifestGenerator:
                 "vin_scope": "all",
             }
 
-        config = yaml.safe_load(config_path.read_text())
+        config = yaml.load(config_path.read_bytes(), Loader=_YamlLoader)
         tiers = config.get("tiers", {})
         tier_config = tiers.get(tier, {})
 
@@ -178,7 +260,8 @@ class OTAManifestGenerator:
         self,
         service_name: str,
         version: str,
-        artifacts: Dict[str, Path]
+        artifacts: Dict[str, Path],
+        timestamp: str
     ) -> Dict[str, str]:
         """Generate cryptographic signature for manifest."""
         # In production, this would use actual signing keys
@@ -191,7 +274,7 @@ class OTAManifestGenerator:
             "algorithm": "RSA-SHA256",
             "keyid": "autoforge-release-key-2026",
             "value": signature_hash,
-            "timestamp": datetime.utcnow().isoformat() + "Z"
+            "timestamp": timestamp
         }
     
     def generate_variant_configs(
@@ -209,81 +292,79 @@ class OTAManifestGenerator:
         Returns:
             Dict mapping variant name to its specific config
         """
-        variants = {}
-        
-        # EV Variant
-        variants["ev"] = {
-            **base_config,
-            "variant": "ev",
-            "features": {
-                "battery_monitoring": True,
-                "regenerative_braking": True,
-                "range_estimation": True,
-                "fast_charging": True,
-            },
-            "signals": [
-                "battery_soc", "battery_voltage", "battery_current",
-                "battery_temperature", "motor_temperature", "motor_torque"
-            ]
-        }
-        
-        # Hybrid Variant
-        variants["hybrid"] = {
-            **base_config,
-            "variant": "hybrid",
-            "features": {
-                "battery_monitoring": True,
-                "regenerative_braking": True,
-                "range_estimation": True,
-                "fast_charging": False,
-                "engine_integration": True,
-            },
-            "signals": [
-                "battery_soc", "battery_voltage", "engine_rpm",
-                "fuel_level", "motor_temperature"
-            ]
-        }
-        
-        # ICE Variant
-        variants["ice"] = {
-            **base_config,
-            "variant": "ice",
-            "features": {
-                "battery_monitoring": False,  # Only 12V battery
-                "regenerative_braking": False,
-                "range_estimation": False,
-                "engine_integration": True,
-            },
-            "signals": [
-                "engine_rpm", "fuel_level", "engine_temperature",
-                "oil_pressure", "coolant_temperature"
-            ]
+        # One dict(base_config, ...) copy per variant, with its own copies of the
+        # module-level feature/signal tables.
+        return {
+            "ev": _build_variant(base_config, "ev", _EV_FEATURES, _EV_SIGNALS),
+            "hybrid": _build_variant(base_config, "hybrid", _HYBRID_FEATURES, _HYBRID_SIGNALS),
+            "ice": _build_variant(base_config, "ice", _ICE_FEATURES, _ICE_SIGNALS),
         }
-        
-        return variants
     
-    def save_manifest(self, manifest: Dict[str, Any], output_path: Path):
-        """Save manifest to YAML file."""
+    def save_manifest(
+        self,
+        manifest: Dict[str, Any],
+        output_path: Path,
+        fmt: Optional[str] = None
+    ):
+        """
+        Save manifest as YAML or JSON.
+
+        fmt is "yaml" or "json"; when omitted it follows the file suffix
+        (.json -> JSON, anything else -> YAML).
+        """
+        if fmt is None:
+            fmt = "json" if output_path.suffix.lower() == ".json" else "yaml"
+        if fmt == "json":
+            self.save_manifest_json(manifest, output_path)
+            return
+        if fmt != "yaml":
+            raise ValueError(f"Unsupported manifest format: {fmt}")
+
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, 'w') as f:
-            yaml.dump(manifest, f, default_flow_style=False, sort_keys=False)
+        # Binary mode + encoding lets the emitter hand UTF-8 bytes straight to
+        # the buffered file instead of going through a text-mode codec.
+        with open(output_path, 'wb', buffering=_YAML_WRITE_BUFFER) as f:
+            yaml.dump(
+                manifest, f, Dumper=_YamlDumper, encoding="utf-8",
+                default_flow_style=False, sort_keys=False,
+            )
         
         print(f"  Saved OTA manifest: {output_path}")
+
+    def save_manifest_json(self, manifest: Dict[str, Any], output_path: Path):
+        """Save manifest as indented JSON (no YAML representer walk) for fleet tooling."""
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(json_bytes(manifest))
+        print(f"  Saved OTA manifest: {output_path}")
     
     def save_variant_configs(
         self,
         variants: Dict[str, Dict[str, Any]],
-        output_dir: Path
+        output_dir: Path,
+        fmt: Optional[str] = None
     ):
-        """Save variant configurations."""
+        """
+        Save variant configurations as config_<variant>.yaml or .json.
+
+        fmt is "yaml" or "json"; when omitted it comes from
+        AUTOFORGE_VARIANT_FORMAT (default "yaml"). Only that one format is
+        written.
+        """
+        if fmt is None:
+            fmt = os.getenv(VARIANT_FORMAT_ENV, "yaml")
+        if fmt not in ("yaml", "json"):
+            raise ValueError(f"Unsupported variant config format: {fmt}")
+
         output_dir.mkdir(parents=True, exist_ok=True)
         
         for variant_name, config in variants.items():
-            config_path = output_dir / f"config_{variant_name}.yaml"
-            with open(config_path, 'w') as f:
-                yaml.dump(config, f, default_flow_style=False)
-            
+            config_path = output_dir / f"config_{variant_name}.{fmt}"
+            if fmt == "json":
+                config_path.write_bytes(json_item(config))
+            else:
+                with open(config_path, 'wb', buffering=_YAML_WRITE_BUFFER) as f:
+                    yaml.dump(config, f, Dumper=_YamlDumper, encoding="utf-8", default_flow_style=False)
             print(f"  Saved variant config: {config_path}")
 
 
@@ -297,7 +378,7 @@ def generate_ota_package(
     Main function to generate complete OTA package.
     
     Creates:
-    - OTA manifest
+    - OTA manifest (YAML, or JSON with AUTOFORGE_OTA_MANIFEST_FORMAT=json)
     - Variant configurations (ICE/Hybrid/EV)
     - Deployment scripts
     """
@@ -311,8 +392,9 @@ def generate_ota_package(
         rollout_strategy="gradual"
     )
     
-    manifest_path = output_dir / "ota_manifest.yaml"
-    generator.save_manifest(manifest, manifest_path)
+    manifest_fmt = os.getenv(MANIFEST_FORMAT_ENV, "yaml")
+    manifest_path = output_dir / f"ota_manifest.{manifest_fmt}"
+    generator.save_manifest(manifest, manifest_path, fmt=manifest_fmt)
     
     # Generate variant configs
     base_config = {
@@ -9,12 +9,141 @@ Supports:
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Union
 import json
 import argparse
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    from .json_io import json_bytes
+except ImportError:  # run as a script: src/codegen itself is on sys.path
+    from json_io import json_bytes
+
+
+# REST <-> SOME/IP payload fields; the mapping table does not depend on the
+# requirement, so it is rendered once at import.
+_PAYLOAD_FIELDS = (
+    "vehicle_speed",
+    "battery_soc",
+    "battery_temperature",
+    "tire_pressure_fl",
+    "tire_pressure_fr",
+    "tire_pressure_rl",
+    "tire_pressure_rr",
+)
+_PAYLOAD_ROWS = "\n".join(
+    f"| `{f}` | `{f}` | same semantic signal |" for f in _PAYLOAD_FIELDS
+)
+
+# Placeholders emitted when the requirement declares no methods / no events.
+_DEFAULT_METHOD_CONST = "static constexpr uint16_t GET_BATTERY_STATUS_ID = 0x0001;"
+_DEFAULT_EVENT_CONST = "static constexpr uint16_t BATTERY_WARNING_ID = 0x8001;"
+_DEFAULT_HANDLER_DECL = "    void on_getbatterystatus(const std::shared_ptr<vsomeip::message>& request);"
+_DEFAULT_METHOD_ID_ROW = "| `GetBatteryStatus` | `0x0001` | `POST /bms/diagnostics` |"
+
+
+def _json_str(value: str) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _vsomeip_config_json(
+    service_name: str, service_id: str, instance_id: str, event_ids: List[str]
+) -> bytes:
+    """
+    Render vsomeip_config.json straight from its fixed shape.
+
+    Produces the same bytes as dumping the equivalent dict with indent=2
+    (orjson's layout), without building the dict first; only the
+    interpolated strings go through the JSON encoder, for escaping.
+    """
+    app_name = _json_str(f"{service_name}_app")
+    if event_ids:
+        events = "[\n        " + ",\n        ".join(map(_json_str, event_ids)) + "\n      ]"
+    else:
+        events = "[]"
+    return f"""{{
+  "unicast": "127.0.0.1",
+  "applications": [
+    {{
+      "name": {app_name},
+      "id": "0x1313"
+    }}
+  ],
+  "services": [
+    {{
+      "service": {_json_str(service_id)},
+      "instance": {_json_str(instance_id)},
+      "unreliable": "30509",
+      "reliable": "30490",
+      "events": {events}
+    }}
+  ],
+  "routing": {app_name}
+}}""".encode("utf-8")
+
+
+def _handler_def(service_name: str, lname: str) -> str:
+    """Handler skeleton for one method; `lname` is the lowercased method name.
+
+    Kept as an f-string: it is compiled once with the module, and renders
+    several times faster than an equivalent str.format() template.
+    """
+    return f"""void {service_name}Service::on_{lname}(const std::shared_ptr<vsomeip::message>& request) {{
+    // Protocol Abstraction skeleton:
+    // Map request payload to domain DTO, call existing service logic, return response.
+    auto response = vsomeip::runtime::get()->create_response(request);
+    // TODO: serialize BMS diagnostics response payload here.
+    app_->send(response);
+}}"""
+
+
+class _ConstNameTable(dict):
+    """str.translate() table mapping every non-alphanumeric character to "_".
+
+    Code points are classified with str.isalnum() on first sight and
+    remembered, so the C-level translate() stays exact for any Unicode input.
+    """
+
+    def __missing__(self, codepoint: int) -> int:
+        mapped = codepoint if chr(codepoint).isalnum() else ord("_")
+        self[codepoint] = mapped
+        return mapped
+
+
+_CONST_NAME_TABLE = _ConstNameTable()
+
+
+# The same method/event IDs and names are formatted by several templates per
+# requirement. typed=True keeps 1, 1.0 and True apart (they format differently).
+# Exact-type dispatch for the ID types YAML actually produces; anything else
+# (None, int subclasses, floats, ...) takes the general branches below.
+_HEX_DISPATCH = {int: hex, bool: hex, str: str}
+
+
+@lru_cache(maxsize=1024, typed=True)
+def _hex_or_default(value: Any, default_hex: str) -> str:
+    format_id = _HEX_DISPATCH.get(type(value))
+    if format_id is not None:
+        return format_id(value)
+    if value is None:
+        return default_hex
+    if isinstance(value, int):
+        return hex(value)
+    return str(value)
+
+
+@lru_cache(maxsize=1024, typed=True)
+def _to_const_name(name: Any) -> str:
+    return str(name).translate(_CONST_NAME_TABLE).upper()
+
 
 class ProtocolAdapterGenerator:
     """Generate protocol adapter artifacts."""
@@ -38,26 +167,24 @@ class ProtocolAdapterGenerator:
         methods = interface.get("methods", [])
         events = interface.get("events", [])
 
-        method_list: List[Dict[str, Any]] = []
-        for m in methods:
-            method_list.append(
-                {
-                    "name": m.get("name"),
-                    "id": m.get("id"),
-                    "input": m.get("input", []),
-                    "output": m.get("output", []),
-                }
-            )
+        method_list: List[Dict[str, Any]] = [
+            {
+                "name": m.get("name"),
+                "id": m.get("id"),
+                "input": m.get("input", []),
+                "output": m.get("output", []),
+            }
+            for m in methods
+        ]
 
-        event_list: List[Dict[str, Any]] = []
-        for e in events:
-            event_list.append(
-                {
-                    "name": e.get("name"),
-                    "id": e.get("id"),
-                    "fields": e.get("fields", []),
-                }
-            )
+        event_list: List[Dict[str, Any]] = [
+            {
+                "name": e.get("name"),
+                "id": e.get("id"),
+                "fields": e.get("fields", []),
+            }
+            for e in events
+        ]
 
         return {
             "protocol": "someip",
@@ -71,16 +198,18 @@ class ProtocolAdapterGenerator:
             "event_groups": [
                 {
                     "name": "default_event_group",
-                    "events": [e.get("name") for e in events if e.get("name")],
+                    "events": [e["name"] for e in event_list if e["name"]],
                 }
             ],
             "events": event_list,
         }
 
-    def generate_someip_abstraction_assets(self, requirement: Dict[str, Any]) -> Dict[str, str]:
+    def generate_someip_abstraction_assets(self, requirement: Dict[str, Any]) -> Dict[str, Union[str, bytes]]:
         """
         Generate Protocol Abstraction artifacts (code skeleton + mapping proof)
         for SOME/IP, while runtime validation can continue using REST transport.
+
+        Source/markdown assets are str; vsomeip_config.json is already-encoded bytes.
         """
         config = self._generate_someip_config(requirement)
         svc = config["service"]
@@ -88,73 +217,64 @@ class ProtocolAdapterGenerator:
         events = config.get("events", [])
         service_name = str(svc.get("name") or "UnknownService")
 
-        service_id = self._hex_or_default(svc.get("service_id"), "0x1001")
-        instance_id = self._hex_or_default(svc.get("instance_id"), "0x0001")
-
-        method_consts = "\n".join(
-            f"static constexpr uint16_t {self._to_const_name(m.get('name', 'METHOD'))}_ID = {self._hex_or_default(m.get('id'), '0x0000')};"
-            for m in methods
-        ) or "static constexpr uint16_t GET_BATTERY_STATUS_ID = 0x0001;"
-
-        event_consts = "\n".join(
-            f"static constexpr uint16_t {self._to_const_name(e.get('name', 'EVENT'))}_ID = {self._hex_or_default(e.get('id'), '0x8000')};"
-            for e in events
-        ) or "static constexpr uint16_t BATTERY_WARNING_ID = 0x8001;"
-
-        method_registration = "\n".join(
-            (
-                f"    app_->register_message_handler({service_id}, {instance_id}, "
-                f"{self._hex_or_default(m.get('id'), '0x0000')}, "
-                f"std::bind(&{service_name}Service::on_{m.get('name', 'method').lower()}, this, std::placeholders::_1));"
+        # Local bindings: the loops below call these once per method/event.
+        hex_or_default = self._hex_or_default
+        to_const_name = self._to_const_name
+
+        service_id = hex_or_default(svc.get("service_id"), "0x1001")
+        instance_id = hex_or_default(svc.get("instance_id"), "0x0001")
+
+        # One pass per list: each method's name/ID is derived once and shared by
+        # every template that mentions it. Empty lists skip straight to the
+        # GetBatteryStatus/BatteryWarning placeholders.
+        if methods:
+            consts: List[str] = []
+            registrations: List[str] = []
+            decls: List[str] = []
+            defs: List[str] = []
+            id_rows: List[str] = []
+            for m in methods:
+                name = m["name"]
+                method_id = hex_or_default(m["id"], "0x0000")
+                lname = name.lower()
+                consts.append(f"static constexpr uint16_t {to_const_name(name)}_ID = {method_id};")
+                registrations.append(
+                    f"    app_->register_message_handler({service_id}, {instance_id}, "
+                    f"{method_id}, "
+                    f"std::bind(&{service_name}Service::on_{lname}, this, std::placeholders::_1));"
+                )
+                decls.append(f"    void on_{lname}(const std::shared_ptr<vsomeip::message>& request);")
+                defs.append(_handler_def(service_name, lname))
+                id_rows.append(f"| `{name}` | `{method_id}` | `POST /bms/diagnostics` |")
+            method_consts = "\n".join(consts)
+            method_registration = "\n".join(registrations)
+            handler_decls = "\n".join(decls)
+            handler_defs = "\n\n".join(defs)
+            method_id_rows = "\n".join(id_rows)
+        else:
+            method_consts = _DEFAULT_METHOD_CONST
+            method_registration = (
+                f"    app_->register_message_handler({service_id}, {instance_id}, 0x0001, "
+                f"std::bind(&{service_name}Service::on_getbatterystatus, this, std::placeholders::_1));"
             )
-            for m in methods
-        ) or (
-            f"    app_->register_message_handler({service_id}, {instance_id}, 0x0001, "
-            f"std::bind(&{service_name}Service::on_getbatterystatus, this, std::placeholders::_1));"
-        )
-
-        handler_decls = "\n".join(
-            f"    void on_{m.get('name', 'method').lower()}(const std::shared_ptr<vsomeip::message>& request);"
-            for m in methods
-        ) or "    void on_getbatterystatus(const std::shared_ptr<vsomeip::message>& request);"
-
-        handler_defs = "\n\n".join(
-            self._handler_def_template(service_name, m.get("name", "method"))
-            for m in methods
-        ) or self._handler_def_template(service_name, "GetBatteryStatus")
-
-        method_id_rows = "\n".join(
-            f"| `{m.get('name')}` | `{self._hex_or_default(m.get('id'), '0x0000')}` | `POST /bms/diagnostics` |"
-            for m in methods
-        ) or "| `GetBatteryStatus` | `0x0001` | `POST /bms/diagnostics` |"
-
-        fields = [
-            "vehicle_speed",
-            "battery_soc",
-            "battery_temperature",
-            "tire_pressure_fl",
-            "tire_pressure_fr",
-            "tire_pressure_rl",
-            "tire_pressure_rr",
-        ]
-        payload_rows = "\n".join(
-            f"| `{f}` | `{f}` | same semantic signal |" for f in fields
-        )
-
-        vsomeip_config = {
-            "unicast": "127.0.0.1",
-            "applications": [{"name": f"{service_name}_app", "id": "0x1313"}],
-            "services": [
-                {
-                    "service": service_id,
-                    "instance": instance_id,
-                    "unreliable": "30509",
-                    "reliable": "30490",
-                    "events": [self._hex_or_default(e.get("id"), "0x8000") for e in events],
-                }
-            ],
-            "routing": f"{service_name}_app",
-        }
+            handler_decls = _DEFAULT_HANDLER_DECL
+            handler_defs = _handler_def(service_name, "getbatterystatus")
+            method_id_rows = _DEFAULT_METHOD_ID_ROW
+
+        event_ids: List[str] = []
+        if events:
+            event_const_lines: List[str] = []
+            for e in events:
+                event_id = hex_or_default(e["id"], "0x8000")
+                event_ids.append(event_id)
+                event_const_lines.append(
+                    f"static constexpr uint16_t {to_const_name(e['name'])}_ID = {event_id};"
+                )
+            event_consts = "\n".join(event_const_lines)
+        else:
+            event_consts = _DEFAULT_EVENT_CONST
+
+        vsomeip_config = _vsomeip_config_json(service_name, service_id, instance_id, event_ids)
 
         header = f"""#pragma once
 #include <cstdint>
@@ -237,7 +357,7 @@ middleware integration.
 
 | REST Field | SOME/IP Payload Field | Notes |
 |---|---|---|
-{payload_rows}
+{_PAYLOAD_ROWS}
 
 ## Scope Clarification
 
@@ -247,7 +367,7 @@ middleware integration.
 """
 
         return {
-            "vsomeip_config.json": json.dumps(vsomeip_config, indent=2),
+            "vsomeip_config.json": vsomeip_config,
             "vsomeip_service.hpp": header,
             "vsomeip_service.cpp": server_cpp,
             "vsomeip_client.cpp": client_cpp,
@@ -256,39 +376,65 @@ middleware integration.
 
     @staticmethod
     def _hex_or_default(value: Any, default_hex: str) -> str:
-        if value is None:
-            return default_hex
-        if isinstance(value, int):
-            return hex(value)
-        return str(value)
+        try:
+            return _hex_or_default(value, default_hex)
+        except TypeError:  # unhashable ID (malformed YAML); format without caching
+            return _hex_or_default.__wrapped__(value, default_hex)
 
     @staticmethod
     def _to_const_name(name: str) -> str:
-        return "".join(c if c.isalnum() else "_" for c in str(name)).upper()
-
-    def _handler_def_template(self, service_name: str, method_name: str) -> str:
-        lname = str(method_name).lower()
-        return f"""void {service_name}Service::on_{lname}(const std::shared_ptr<vsomeip::message>& request) {{
-    // Protocol Abstraction skeleton:
-    // Map request payload to domain DTO, call existing service logic, return response.
-    auto response = vsomeip::runtime::get()->create_response(request);
-    // TODO: serialize BMS diagnostics response payload here.
-    app_->send(response);
-}}"""
+        try:
+            return _to_const_name(name)
+        except TypeError:
+            return _to_const_name.__wrapped__(name)
 
     def save(self, config: Dict[str, Any], output_path: Path) -> Path:
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(json.dumps(config, indent=2))
+        output_path.write_bytes(json_bytes(config))
         return output_path
 
-    def save_assets(self, assets: Dict[str, str], output_dir: Path) -> List[Path]:
+    def save_assets(self, assets: Dict[str, Union[str, bytes]], output_dir: Path) -> List[Path]:
         output_dir.mkdir(parents=True, exist_ok=True)
-        written: List[Path] = []
-        for name, content in assets.items():
-            path = output_dir / name
-            path.write_text(content)
-            written.append(path)
-        return written
+        if not assets:
+            return []
+        # The files are independent and file writes release the GIL, so they are
+        # written concurrently; map() keeps the returned paths in asset order.
+        with ThreadPoolExecutor(max_workers=min(5, len(assets))) as ex:
+            return list(ex.map(self._write_asset, [output_dir / name for name in assets], assets.values()))
+
+    @staticmethod
+    def _write_asset(path: Path, content: Union[str, bytes]) -> Path:
+        # Bytes assets (the orjson config) are written as-is; text is UTF-8
+        # with LF line endings on every platform.
+        path.write_bytes(content if isinstance(content, bytes) else content.encode("utf-8"))
+        return path
+
+
+def run(
+    requirement_path: Path,
+    output_path: Path,
+    abstraction_dir: Optional[Path] = None,
+) -> List[Path]:
+    """
+    Library entry point behind the CLI: generate and save the protocol config
+    (and, for SOME/IP, the abstraction artifacts when abstraction_dir is set).
+
+    Batch callers can invoke this directly per requirement instead of paying
+    for a process and argparse each time. Returns the written paths, config first.
+    """
+    if not requirement_path.exists():
+        raise FileNotFoundError(f"Requirement file not found: {requirement_path}")
+
+    # Raw bytes: libyaml detects and decodes the encoding itself.
+    requirement = yaml.load(requirement_path.read_bytes(), Loader=_YamlLoader)
+    generator = ProtocolAdapterGenerator()
+    config = generator.generate(requirement)
+    written = [generator.save(config, output_path)]
+
+    if abstraction_dir and config.get("protocol") == "someip":
+        assets = generator.generate_someip_abstraction_assets(requirement)
+        written.extend(generator.save_assets(assets, abstraction_dir))
+    return written
 
 
 def main() -> int:
@@ -302,21 +448,14 @@ def main() -> int:
     )
     args = parser.parse_args()
 
-    requirement_path = Path(args.requirement)
-    if not requirement_path.exists():
-        raise FileNotFoundError(f"Requirement file not found: {requirement_path}")
-
-    requirement = yaml.safe_load(requirement_path.read_text())
-    generator = ProtocolAdapterGenerator()
-    config = generator.generate(requirement)
-    output_path = generator.save(config, Path(args.output))
-    print(f"Saved protocol config: {output_path}")
-
-    if args.abstraction_dir and config.get("protocol") == "someip":
-        assets = generator.generate_someip_abstraction_assets(requirement)
-        written = generator.save_assets(assets, Path(args.abstraction_dir))
-        for p in written:
-            print(f"Saved abstraction artifact: {p}")
+    written = run(
+        Path(args.requirement),
+        Path(args.output),
+        Path(args.abstraction_dir) if args.abstraction_dir else None,
+    )
+    print(f"Saved protocol config: {written[0]}")
+    for p in written[1:]:
+        print(f"Saved abstraction artifact: {p}")
     return 0
 
 
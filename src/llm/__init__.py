@@ -1,6 +1,7 @@
 # AUTOFORGE LLM Module
 from .client import (
     get_client,
+    generate_batch,
     LLMClient,
     GeminiClient,
     OpenAIClient,
@@ -16,6 +17,7 @@ from .prompts import (
 
 __all__ = [
     "get_client",
+    "generate_batch",
     "LLMClient", 
     "GeminiClient",
     "OpenAIClient",
@@ -17,25 +17,10 @@ class AgentRole(Enum):
     ARCHITECT = "architect"  # Creative, implementation-focused, writes code
 
 
-class AdversarialLLMClient(LLMClient):
-    """
-    Base class for adversarial LLM clients.
-    Adds role-specific system prompts on top of base LLM functionality.
-    """
-    
-    def __init__(self, base_client: LLMClient, role: AgentRole):
-        self.base_client = base_client
-        self.role = role
-        
-        # Auditor uses lower temperature (more deterministic/strict)
-        # Architect uses higher temperature (more creative)
-        if hasattr(self.base_client, 'temperature'):
-            self.base_client.temperature = 0.1 if role == AgentRole.AUDITOR else 0.3
-    
-    def get_role_system_prompt(self) -> str:
-        """Get role-specific system prompt that enforces adversarial behavior."""
-        if self.role == AgentRole.AUDITOR:
-            return """🔴 YOU ARE THE AUDITOR - THE SKEPTICAL SAFETY WATCHDOG
+# Role system prompts depend only on the role; get_role_system_prompt() and
+# generate() hand out these shared strings.
+_ROLE_PROMPTS = {
+    AgentRole.AUDITOR: """🔴 YOU ARE THE AUDITOR - THE SKEPTICAL SAFETY WATCHDOG
 
 YOUR MISSION:
 - Generate COMPREHENSIVE tests that will CATCH bugs and safety violations
@@ -56,10 +41,8 @@ TEST COVERAGE REQUIREMENTS:
 - Error handling and exception paths
 
 OUTPUT FORMAT:
-Generate ONLY the test code. No explanations. Pure executable tests."""
-        
-        else:  # ARCHITECT
-            return """🟢 YOU ARE THE ARCHITECT - THE CODE IMPLEMENTATION EXPERT
+Generate ONLY the test code. No explanations. Pure executable tests.""",
+    AgentRole.ARCHITECT: """🟢 YOU ARE THE ARCHITECT - THE CODE IMPLEMENTATION EXPERT
 
 YOUR MISSION:
 - Write clean, safe, production-quality code that PASSES EVERY TEST
@@ -80,22 +63,48 @@ The Auditor has already written strict tests. Your job is to write code SO GOOD
 that it passes every single one. This is production automotive code - lives depend on it.
 
 OUTPUT FORMAT:
-Generate ONLY the implementation code. No explanations. Pure executable code."""
+Generate ONLY the implementation code. No explanations. Pure executable code.""",
+}
+
+
+class AdversarialLLMClient(LLMClient):
+    """
+    Base class for adversarial LLM clients.
+    Adds role-specific system prompts on top of base LLM functionality.
+    """
+    
+    def __init__(self, base_client: LLMClient, role: AgentRole):
+        self.base_client = base_client
+        self.role = role
+        
+        # Auditor uses lower temperature (more deterministic/strict)
+        # Architect uses higher temperature (more creative)
+        if hasattr(self.base_client, 'temperature'):
+            self.base_client.temperature = 0.1 if role == AgentRole.AUDITOR else 0.3
+    
+    def get_role_system_prompt(self) -> str:
+        """Get role-specific system prompt that enforces adversarial behavior."""
+        return _ROLE_PROMPTS[self.role]
     
+    def _combined_system_prompt(self, system_prompt: Optional[str]) -> str:
+        role_prompt = _ROLE_PROMPTS[self.role]
+        if not system_prompt:
+            return role_prompt
+        # Combine role prompt with optional custom system prompt
+        return f"{role_prompt}\n\n{system_prompt}"
+
     def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
         """
         Generate text with role-specific system prompt prepended.
         """
-        role_prompt = self.get_role_system_prompt()
-        
-        # Combine role prompt with optional custom system prompt
-        if system_prompt:
-            full_system = f"{role_prompt}\n\n{system_prompt}"
-        else:
-            full_system = role_prompt
-        
-        return self.base_client.generate(prompt, system_prompt=full_system)
+        return self.base_client.generate(prompt, system_prompt=self._combined_system_prompt(system_prompt))
 
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """
+        Async generate() that goes through the base client's agenerate(), so
+        providers with a native async API never block a worker thread.
+        """
+        return await self.base_client.agenerate(prompt, system_prompt=self._combined_system_prompt(system_prompt))
 
 # ============================================================================
 # Factory Functions - Primary API for Pipeline
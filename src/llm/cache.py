@@ -0,0 +1,210 @@
+"""
+Content-addressed disk cache for LLM completions.
+
+Opt-in: set AUTOFORGE_LLM_CACHE_DIR to a directory and repeated prompts
+(e.g. re-running CI on unchanged requirements) are answered from disk instead
+of the provider. Leave it unset for torture/benchmark runs, where every call
+must really reach the model. AUTOFORGE_LLM_CACHE_TTL (seconds) optionally
+expires entries; recent hits are also kept in memory, so a prompt repeated
+within one process does not touch the disk again.
+
+Independently of the disk cache, identical requests that are in flight at
+the same time (e.g. a concurrent fan-out over variants with the same
+interface) share a single provider call.
+"""
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+CACHE_DIR_ENV = "AUTOFORGE_LLM_CACHE_DIR"
+CACHE_TTL_ENV = "AUTOFORGE_LLM_CACHE_TTL"
+_MEMORY_ENTRIES = 256
+
+
+def cache_dir() -> Optional[Path]:
+    """Return the configured cache directory, or None when caching is disabled."""
+    value = os.getenv(CACHE_DIR_ENV)
+    return Path(value) if value else None
+
+
+def cache_ttl() -> Optional[float]:
+    """Return the entry lifetime in seconds, or None when entries never expire."""
+    value = os.getenv(CACHE_TTL_ENV)
+    return float(value) if value else None
+
+
+def cache_key(client: object, prompt: str, system_prompt: Optional[str] = None) -> str:
+    """SHA-256 over everything that shapes the completion, not just the prompt."""
+    digest = hashlib.sha256()
+    for part in (
+        type(client).__name__,
+        str(getattr(client, "model", "")),
+        str(getattr(client, "temperature", "")),
+        system_prompt or "",
+        prompt,
+    ):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _entry_path(root: Path, key: str) -> Path:
+    return root / key[:2] / f"{key}.txt"
+
+
+def _read(path: Path, ttl: Optional[float]) -> Optional[Tuple[float, str]]:
+    """Return (mtime, text) for a live entry, or None when missing or expired."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            mtime = os.fstat(f.fileno()).st_mtime
+            if ttl is not None and time.time() - mtime > ttl:
+                return None
+            return mtime, f.read()
+    except FileNotFoundError:
+        return None
+
+
+# Most recent hits/fills, keyed by (cache dir, key) -> (written-at, text).
+_memory: "OrderedDict[Tuple[str, str], Tuple[float, str]]" = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def _remember(slot: Tuple[str, str], written_at: float, text: str) -> None:
+    with _memory_lock:
+        _memory[slot] = (written_at, text)
+        _memory.move_to_end(slot)
+        if len(_memory) > _MEMORY_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def _lookup(root: Path, key: str) -> Optional[str]:
+    """Cached completion for key from memory, then disk; None on a miss."""
+    ttl = cache_ttl()
+    slot = (str(root), key)
+    with _memory_lock:
+        hit = _memory.get(slot)
+        if hit is not None and (ttl is None or time.time() - hit[0] <= ttl):
+            _memory.move_to_end(slot)
+            return hit[1]
+    entry = _read(_entry_path(root, key), ttl)
+    if entry is None:
+        return None
+    _remember(slot, *entry)
+    return entry[1]
+
+
+def _store(root: Path, key: str, text: str) -> None:
+    _write_atomic(_entry_path(root, key), text)
+    _remember((str(root), key), time.time(), text)
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Write via a temp file + rename so concurrent readers never see partial entries."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+# Requests currently being generated, keyed by cache_key(). A caller that asks
+# for a prompt already in flight waits for that result instead of sending a
+# duplicate request. Async entries are per event loop (asyncio tasks are
+# loop-bound); threads share concurrent.futures.Future entries.
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+_ainflight: Dict[Tuple[asyncio.AbstractEventLoop, str], "asyncio.Task[str]"] = {}
+
+
+def _coalesced(key: str, call: Callable[[], str]) -> str:
+    with _inflight_lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = _inflight[key] = Future()
+    if not owner:
+        return future.result()
+    try:
+        result = call()
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+
+
+async def _acoalesced(key: str, make_call: Callable[[], Awaitable[str]]) -> str:
+    task_key = (asyncio.get_running_loop(), key)
+    task = _ainflight.get(task_key)
+    if task is None:
+        task = _ainflight[task_key] = asyncio.ensure_future(make_call())
+        task.add_done_callback(lambda _: _ainflight.pop(task_key, None))
+    # shield(): one cancelled waiter must not cancel the request the others share.
+    return await asyncio.shield(task)
+
+
+def cached_generate(generate):
+    """
+    Decorate a client's generate()/agenerate() with the disk cache and
+    in-flight request coalescing.
+
+    The wrapped method must have the (self, prompt, system_prompt=None)
+    signature shared by all LLMClient implementations.
+    """
+    if inspect.iscoroutinefunction(generate):
+
+        @functools.wraps(generate)
+        async def async_wrapper(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+            key = cache_key(self, prompt, system_prompt)
+            root = cache_dir()
+            if root is None:
+                return await _acoalesced(key, lambda: generate(self, prompt, system_prompt))
+            cached = _lookup(root, key)
+            if cached is not None:
+                return cached
+
+            async def fill() -> str:
+                result = await generate(self, prompt, system_prompt)
+                _store(root, key, result)
+                return result
+
+            return await _acoalesced(key, fill)
+
+        return async_wrapper
+
+    @functools.wraps(generate)
+    def wrapper(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        key = cache_key(self, prompt, system_prompt)
+        root = cache_dir()
+        if root is None:
+            return _coalesced(key, lambda: generate(self, prompt, system_prompt))
+        cached = _lookup(root, key)
+        if cached is not None:
+            return cached
+
+        def fill() -> str:
+            result = generate(self, prompt, system_prompt)
+            _store(root, key, result)
+            return result
+
+        return _coalesced(key, fill)
+
+    return wrapper
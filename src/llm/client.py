@@ -3,14 +3,21 @@ LLM Client Abstraction for AUTOFORGE
 Supports multiple LLM providers with unified interface
 """
 
+import asyncio
+import functools
+import http.client
 import os
 import json
+import re
+import threading
 import warnings
 from abc import ABC, abstractmethod
-from typing import Optional
-import yaml
-import urllib.request
+from typing import List, Optional, Sequence
 import urllib.error
+import urllib.parse
+import urllib.request
+
+from .cache import cached_generate
 
 # Suppress noisy upstream deprecation warning from google-generativeai package.
 warnings.filterwarnings(
@@ -28,6 +35,40 @@ class LLMClient(ABC):
         """Generate text from prompt."""
         pass
 
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """
+        Async variant of generate().
+
+        Providers without a native async API run the blocking call in a worker
+        thread, so concurrent awaits still overlap their network round-trips.
+        """
+        return await asyncio.to_thread(self.generate, prompt, system_prompt)
+
+
+# SDK handles are process-wide: an Auditor/Architect pair (or any number of
+# client instances) shares one model object and its HTTP pool. Temperature is
+# passed with each request, so it never needs a separate handle.
+@functools.lru_cache(maxsize=8)
+def _gemini_model(model: str):
+    # Suppress upstream deprecation warning noise in CLI output.
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        import google.generativeai as genai
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        raise ValueError("GOOGLE_API_KEY environment variable not set")
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(model)
+
+
+@functools.lru_cache(maxsize=1)
+def _openai_client():
+    from openai import OpenAI
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY environment variable not set")
+    return OpenAI(api_key=api_key)
+
 
 class GeminiClient(LLMClient):
     """Google Gemini client."""
@@ -39,17 +80,10 @@ class GeminiClient(LLMClient):
         
     def _get_client(self):
         if self._client is None:
-            # Suppress upstream deprecation warning noise in CLI output.
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore", FutureWarning)
-                import google.generativeai as genai
-            api_key = os.getenv("GOOGLE_API_KEY")
-            if not api_key:
-                raise ValueError("GOOGLE_API_KEY environment variable not set")
-            genai.configure(api_key=api_key)
-            self._client = genai.GenerativeModel(self.model)
+            self._client = _gemini_model(self.model)
         return self._client
     
+    @cached_generate
     def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
         client = self._get_client()
         
@@ -66,6 +100,23 @@ class GeminiClient(LLMClient):
         )
         return response.text
 
+    @cached_generate
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        client = self._get_client()
+
+        full_prompt = prompt
+        if system_prompt:
+            full_prompt = f"{system_prompt}\n\n{prompt}"
+
+        response = await client.generate_content_async(
+            full_prompt,
+            generation_config={
+                "temperature": self.temperature,
+                "max_output_tokens": 4096,
+            }
+        )
+        return response.text
+
 
 class OpenAIClient(LLMClient):
     """OpenAI client."""
@@ -77,13 +128,10 @@ class OpenAIClient(LLMClient):
         
     def _get_client(self):
         if self._client is None:
-            from openai import OpenAI
-            api_key = os.getenv("OPENAI_API_KEY")
-            if not api_key:
-                raise ValueError("OPENAI_API_KEY environment variable not set")
-            self._client = OpenAI(api_key=api_key)
+            self._client = _openai_client()
         return self._client
     
+    @cached_generate
     def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
         client = self._get_client()
         
@@ -125,6 +173,7 @@ class OllamaClient(LLMClient):
                 pass
         self.timeout_seconds = timeout_seconds
     
+    @cached_generate
     def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
         payload = {
             "model": self.model,
@@ -161,6 +210,7 @@ class GroqClient(LLMClient):
         if not self.api_key:
             raise ValueError("GROQ_API_KEY environment variable not set")
     
+    @cached_generate
     def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
         messages = []
         if system_prompt:
@@ -178,27 +228,12 @@ class GroqClient(LLMClient):
         return response.get("choices", [{}])[0].get("message", {}).get("content", "")
 
 
-class MockClient(LLMClient):
-    """Mock client for testing without API calls."""
-    
-    def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
-        # Return mock response based on prompt content
-        # Check for test generation prompt specifically
-        if "generate comprehensive unit tests" in prompt.lower() or "generate python pytest tests" in prompt.lower():
-            return self._mock_test_code()
-        elif "generate" in prompt.lower() and "implementation" in prompt.lower():
-            # Code generation
-            if "cpp" in prompt.lower() or "c++" in prompt.lower():
-                return self._mock_cpp_code()
-            else:
-                return self._mock_python_code()
-        elif "cpp" in prompt.lower() or "c++" in prompt.lower():
-            return self._mock_cpp_code()
-        else:
-            return self._mock_python_code()
-    
-    def _mock_test_code(self) -> str:
-        return '''
+_MOCK_TEST_PROMPT = re.compile(
+    "generate comprehensive unit tests|generate python pytest tests", re.IGNORECASE
+).search
+_MOCK_CPP_PROMPT = re.compile(r"cpp|c\+\+", re.IGNORECASE).search
+
+_MOCK_TEST_CODE = '''
 import pytest
 
 def test_get_battery_status():
@@ -218,9 +253,8 @@ def test_low_battery_warning():
     warnings = service.get_warnings()
     assert any(w.code == 0x0001 for w in warnings)
 '''
-    
-    def _mock_cpp_code(self) -> str:
-        return '''
+
+_MOCK_CPP_CODE = '''
 #include "bms_diagnostic_service.hpp"
 #include <vsomeip/vsomeip.hpp>
 
@@ -257,9 +291,8 @@ private:
     float battery_temperature_ = 0.0f;
 };
 '''
-    
-    def _mock_python_code(self) -> str:
-        return '''
+
+_MOCK_PYTHON_CODE = '''
 from dataclasses import dataclass
 from typing import List
 from enum import IntEnum
@@ -302,20 +335,92 @@ class BMSDiagnosticService:
 '''
 
 
+class MockClient(LLMClient):
+    """Mock client for testing without API calls."""
+    
+    def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        # Return mock response based on prompt content: test-generation prompts
+        # get tests, anything mentioning C++ gets C++, everything else Python.
+        # Case-insensitive regex scans avoid lowering a copy of the whole prompt.
+        if _MOCK_TEST_PROMPT(prompt):
+            return _MOCK_TEST_CODE
+        if _MOCK_CPP_PROMPT(prompt):
+            return _MOCK_CPP_CODE
+        return _MOCK_PYTHON_CODE
+
+
+_CLIENTS = {
+    "gemini": GeminiClient,
+    "openai": OpenAIClient,
+    "ollama": OllamaClient,
+    "groq": GroqClient,
+    "mock": MockClient,
+}
+
+# Default-configured clients that are safe to share process-wide. The Gemini SDK
+# model keeps one pooled, already-handshaken channel, so generators built back to
+# back reuse it instead of each opening their own TLS session; MockClient is
+# stateless.
+_SHARED_PROVIDERS = {"gemini", "mock"}
+_shared_clients: dict = {}
+_shared_lock = threading.Lock()
+
+
 def get_client(provider: str = "gemini", **kwargs) -> LLMClient:
     """Factory function to get LLM client."""
-    clients = {
-        "gemini": GeminiClient,
-        "openai": OpenAIClient,
-        "ollama": OllamaClient,
-        "groq": GroqClient,
-        "mock": MockClient,
-    }
-    
-    if provider not in clients:
-        raise ValueError(f"Unknown provider: {provider}. Available: {list(clients.keys())}")
-    
-    return clients[provider](**kwargs)
+    client_cls = _CLIENTS.get(provider)
+    if client_cls is None:
+        raise ValueError(f"Unknown provider: {provider}. Available: {list(_CLIENTS)}")
+
+    if kwargs or provider not in _SHARED_PROVIDERS:
+        return client_cls(**kwargs)
+    with _shared_lock:
+        client = _shared_clients.get(provider)
+        if client is None:
+            client = _shared_clients[provider] = client_cls()
+        return client
+
+
+async def generate_batch(
+    client: LLMClient,
+    prompts: Sequence[str],
+    system_prompt: Optional[str] = None,
+    concurrency: int = 16,
+) -> List[str]:
+    """
+    Run independent prompts through client.agenerate() concurrently.
+
+    At most `concurrency` requests are in flight at once; results come back in
+    prompt order. A batch of latency-bound calls then takes roughly the slowest
+    call per wave instead of the sum of all of them.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(prompt: str) -> str:
+        async with semaphore:
+            return await client.agenerate(prompt, system_prompt)
+
+    return list(await asyncio.gather(*(one(prompt) for prompt in prompts)))
+
+
+# Keep-alive connections for _post_json(), one per (scheme, host) per thread
+# (http.client connections are not thread-safe). Long Ollama/Groq sweeps then
+# pay the TCP (and TLS) handshake once instead of on every request.
+_http_local = threading.local()
+
+
+def _pooled_connection(scheme: str, netloc: str, timeout_seconds: int) -> http.client.HTTPConnection:
+    pool = getattr(_http_local, "connections", None)
+    if pool is None:
+        pool = _http_local.connections = {}
+    conn = pool.get((scheme, netloc))
+    if conn is None:
+        conn_cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        conn = pool[(scheme, netloc)] = conn_cls(netloc, timeout=timeout_seconds)
+    conn.timeout = timeout_seconds
+    if conn.sock is not None:
+        conn.sock.settimeout(timeout_seconds)
+    return conn
 
 
 def _post_json(
@@ -329,7 +434,43 @@ def _post_json(
     req_headers = {"Content-Type": "application/json"}
     if headers:
         req_headers.update(headers)
-    request = urllib.request.Request(url, data=data, headers=req_headers, method="POST")
+
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme not in ("http", "https") or (
+        urllib.request.getproxies().get(parts.scheme)
+        and not urllib.request.proxy_bypass(parts.hostname or "")
+    ):
+        # Proxied (or unusual) URLs keep going through urllib's handler chain.
+        return _post_json_urllib(url, data, req_headers, timeout_seconds)
+
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    while True:
+        conn = _pooled_connection(parts.scheme, parts.netloc, timeout_seconds)
+        reused = conn.sock is not None
+        try:
+            conn.request("POST", path, body=data, headers=req_headers)
+            response = conn.getresponse()
+            body = response.read()
+        except (ConnectionResetError, BrokenPipeError) as e:
+            conn.close()
+            # The server dropped an idle keep-alive connection; retry once on a fresh one.
+            if reused:
+                continue
+            raise RuntimeError(f"URLError: {e}") from e
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            raise RuntimeError(f"URLError: {e}") from e
+        break
+
+    if response.status >= 400:
+        raise RuntimeError(f"HTTPError {response.status}: {body.decode('utf-8')}")
+    return json.loads(body)
+
+
+def _post_json_urllib(url: str, data: bytes, headers: dict, timeout_seconds: int) -> dict:
+    request = urllib.request.Request(url, data=data, headers=headers, method="POST")
     try:
         with urllib.request.urlopen(request, timeout=timeout_seconds) as response:
             body = response.read().decode("utf-8")
@@ -3,6 +3,35 @@ Prompt Templates for AUTOFORGE
 Test-First approach: Generate tests before implementation
 """
 
+import string
+
+
+class PromptTemplate:
+    """
+    A str.format-style prompt split once into literal runs and {field} slots.
+
+    substitute() only joins the cached pieces with the field values, so hot
+    generation loops skip re-parsing the format string on every call.
+    """
+
+    __slots__ = ("_parts",)
+
+    def __init__(self, source: str):
+        parts = []
+        for literal, field, spec, conversion in string.Formatter().parse(source):
+            if spec or conversion:
+                raise ValueError(f"Unsupported format spec in prompt field: {field}")
+            parts.append((literal, field))
+        self._parts = tuple(parts)
+
+    def substitute(self, **values) -> str:
+        out = []
+        for literal, field in self._parts:
+            out.append(literal)
+            if field is not None:
+                out.append(str(values[field]))
+        return "".join(out)
+
 SYSTEM_PROMPT = """You are an expert automotive software engineer specializing in:
 - Service-Oriented Architecture (SoA) for vehicles
 - SOME/IP protocol implementation
@@ -57,6 +86,9 @@ TARGET PROTOCOL: {protocol}
 Output ONLY the {language} code, no explanations.
 """
 
+TEST_GENERATION_TMPL = PromptTemplate(TEST_GENERATION_PROMPT)
+CODE_GENERATION_TMPL = PromptTemplate(CODE_GENERATION_PROMPT)
+
 CPP_SOMEIP_TEMPLATE = """
 Generate a C++ SOME/IP service skeleton for:
 
@@ -108,7 +140,24 @@ Requirements:
 Output ONLY the Rust code.
 """
 
-KOTLIN_SERVICE_TEMPLATE = """
+# Code-generator prompts: the SOME/IP templates above followed by the tests
+# the generated service must pass (fenced in the target language).
+_MUST_PASS_TESTS = """
+
+IMPORTANT: The implementation MUST pass these tests:
+```{fence}
+{{test_code}}
+```
+"""
+
+CPP_SERVICE_TMPL = PromptTemplate(
+    "\n" + CPP_SOMEIP_TEMPLATE + _MUST_PASS_TESTS.format(fence="cpp")
+)
+RUST_SERVICE_TMPL = PromptTemplate(
+    "\n" + RUST_SOMEIP_TEMPLATE + _MUST_PASS_TESTS.format(fence="rust")
+)
+
+KOTLIN_SERVICE_TMPL = PromptTemplate("""
 Generate a Kotlin service for Android Automotive:
 
 SERVICE: {service_name}
@@ -121,10 +170,38 @@ Requirements:
 2. Follow Android Automotive patterns
 3. Include proper null safety
 4. Use data classes for DTOs
-5. Minimum 200 non-empty lines of production-quality code
+5. Minimum 200 non-empty lines
 
-Output ONLY the Kotlin code.
-"""
+The implementation MUST pass these tests:
+```kotlin
+{test_code}
+```
+
+Output ONLY Kotlin code.
+""")
+
+JAVA_SERVICE_TMPL = PromptTemplate("""
+Generate a Java service for Android Automotive:
+
+SERVICE: {service_name}
+
+METHODS:
+{methods_yaml}
+
+Requirements:
+1. Use Java 17 compatible code
+2. Follow Android Automotive service patterns
+3. Include defensive coding and null checks
+4. Use POJOs for DTOs
+5. Minimum 200 non-empty lines
+
+The implementation MUST pass these tests:
+```java
+{test_code}
+```
+
+Output ONLY Java code.
+""")
 
 HMI_DASHBOARD_TEMPLATE = """
 Generate a React dashboard component for vehicle health monitoring.
@@ -181,6 +258,8 @@ REQUIREMENTS:
 Output ONLY the C++ header file (.hpp) with the wrapper class.
 """
 
+ML_WRAPPER_TMPL = PromptTemplate(ML_WRAPPER_TEMPLATE)
+
 VALIDATION_PROMPT = """
 Review the following generated code for issues:
 
@@ -203,3 +282,5 @@ Output a JSON object:
     "suggestions": ["suggestion1", ...]
 }}
 """
+
+VALIDATION_TMPL = PromptTemplate(VALIDATION_PROMPT)
@@ -8,13 +8,22 @@ then exports the model to ONNX.
 from __future__ import annotations
 
 import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from importlib import metadata
 from pathlib import Path
 from typing import Optional
 
 import numpy as np
 
 
-def _load_or_generate_data(csv_path: Optional[Path], rows: int = 1000):
+_SYNTHETIC_ROWS = 1000
+
+
+def _load_or_generate_data(csv_path: Optional[Path], rows: int = _SYNTHETIC_ROWS):
     """Load training data from CSV or generate deterministic synthetic data."""
     if csv_path and csv_path.exists():
         try:
@@ -49,62 +58,219 @@ def _load_or_generate_data(csv_path: Optional[Path], rows: int = 1000):
         y = df["failure_score"].to_numpy(dtype=np.float32)
         return x, y
 
-    # Synthetic fallback for no-data environments
+    # Synthetic fallback for no-data environments. Draws are cast straight into
+    # one (rows, 6) float32 buffer in the original order, so the data (and the
+    # seeded model) are unchanged without per-column temporaries + concatenate.
     rng = np.random.default_rng(42)
-    tire = rng.normal(loc=32.0, scale=2.0, size=(rows, 4)).astype(np.float32)
-    speed = rng.uniform(0, 140, size=(rows, 1)).astype(np.float32)
-    temp = rng.uniform(-10, 45, size=(rows, 1)).astype(np.float32)
-    x = np.concatenate([tire, speed, temp], axis=1)
+    x = np.empty((rows, 6), dtype=np.float32)
+    x[:, :4] = rng.normal(loc=32.0, scale=2.0, size=(rows, 4))
+    x[:, 4] = rng.uniform(0, 140, size=rows)
+    x[:, 5] = rng.uniform(-10, 45, size=rows)
+    tire = x[:, :4]
+    speed = x[:, 4]
 
     # Higher risk when pressure drops away from nominal and speed is high
     pressure_penalty = np.abs(tire - 32.0).mean(axis=1)
-    speed_factor = (speed[:, 0] / 140.0) * 0.25
+    speed_factor = (speed / 140.0) * 0.25
     y = np.clip(0.15 * pressure_penalty + speed_factor, 0.0, 1.0).astype(np.float32)
     return x, y
 
 
-def train_and_export(csv_path: Optional[Path], output_model: Path) -> Path:
-    """Train sklearn model and export ONNX model."""
-    try:
+BACKENDS = ("sklearn", "lightgbm")
+
+_HYPERPARAMS = {
+    # Histogram-based boosting: much faster than the forest on large CSVs.
+    "lightgbm": {
+        "n_estimators": 400,
+        "max_depth": 8,
+        "num_leaves": 63,
+        "colsample_bytree": 0.8,
+        "force_row_wise": True,
+        "random_state": 42,
+        "n_jobs": -1,
+        "verbose": -1,
+    },
+    "sklearn": {
+        "n_estimators": 100,
+        "max_depth": 8,
+        "random_state": 42,
+        "n_jobs": -1,
+    },
+}
+
+# Packages whose version can change the fitted model or its ONNX encoding.
+_BACKEND_PACKAGES = {
+    "lightgbm": ("numpy", "scikit-learn", "lightgbm", "onnxmltools", "onnx"),
+    "sklearn": ("numpy", "scikit-learn", "skl2onnx", "onnx"),
+}
+_HASH_READ_SIZE = 1 << 20
+# Bump when data loading, the synthetic formula, the train/test split or the
+# ONNX export change, so models cached by older code are not reused.
+_CACHE_VERSION = 1
+
+
+def _fit_model(backend: str, x_train, y_train):
+    """Fit the regressor for `backend` on the training split."""
+    if backend == "lightgbm":
+        try:
+            import lightgbm as lgb
+        except ImportError as exc:
+            raise RuntimeError("lightgbm is required for --backend lightgbm") from exc
+
+        model = lgb.LGBMRegressor(**_HYPERPARAMS[backend])
+    else:
         from sklearn.ensemble import RandomForestRegressor
+
+        model = RandomForestRegressor(**_HYPERPARAMS[backend])
+    model.fit(x_train, y_train)
+    return model
+
+
+def _to_onnx(backend: str, model):
+    """Convert a fitted model to ONNX with the shared 6-signal float input."""
+    if backend == "lightgbm":
+        try:
+            from onnxmltools import convert_lightgbm
+            from onnxmltools.convert.common.data_types import FloatTensorType
+        except ImportError as exc:
+            raise RuntimeError("onnxmltools is required for LightGBM ONNX export") from exc
+
+        initial_type = [("tire_signals", FloatTensorType([None, 6]))]
+        return convert_lightgbm(model, initial_types=initial_type)
+
+    try:
+        from skl2onnx import convert_sklearn
+        from skl2onnx.common.data_types import FloatTensorType
+    except ImportError as exc:
+        raise RuntimeError("skl2onnx is required for ONNX export") from exc
+
+    initial_type = [("tire_signals", FloatTensorType([None, 6]))]
+    return convert_sklearn(model, initial_types=initial_type)
+
+
+def _package_version(name: str) -> str:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return "missing"
+
+
+def _model_cache_key(csv_path: Optional[Path], backend: str, rows: int) -> str:
+    """SHA-256 over the training data and everything that shapes the exported model."""
+    digest = hashlib.sha256()
+    if csv_path and csv_path.exists():
+        with open(csv_path, "rb") as f:
+            while chunk := f.read(_HASH_READ_SIZE):
+                digest.update(chunk)
+    else:
+        digest.update(b"synthetic")
+    digest.update(b"\0")
+    digest.update(
+        json.dumps(
+            {
+                "backend": backend,
+                "cache_version": _CACHE_VERSION,
+                "rows": rows,
+                "hyperparams": _HYPERPARAMS[backend],
+                "versions": {name: _package_version(name) for name in _BACKEND_PACKAGES[backend]},
+            },
+            sort_keys=True,
+        ).encode("utf-8")
+    )
+    return digest.hexdigest()
+
+
+def _replace_atomically(target: Path, write) -> None:
+    """Run `write(tmp_path)` then rename onto `target`, so readers never see a partial file."""
+    fd, tmp = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _store_cached_model(model_path: Path, cache_path: Path, metrics: dict) -> None:
+    """Cache the exported model, with its training metrics beside it (same key, .json)."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    _replace_atomically(
+        cache_path.with_suffix(".json"),
+        lambda tmp: Path(tmp).write_text(json.dumps(metrics), encoding="utf-8"),
+    )
+    _replace_atomically(cache_path, lambda tmp: shutil.copyfile(model_path, tmp))
+
+
+def _print_metrics(metrics: dict, note: str = "") -> None:
+    print(f"[ML] Backend: {metrics['backend']}{note}")
+    print(f"[ML] Training samples: {metrics['train_samples']}")
+    print(f"[ML] Test samples: {metrics['test_samples']}")
+    print(f"[ML] MSE: {metrics['mse']:.6f}")
+
+
+def train_and_export(
+    csv_path: Optional[Path],
+    output_model: Path,
+    backend: str = "sklearn",
+    force: bool = False,
+    rows: int = _SYNTHETIC_ROWS,
+) -> Path:
+    """
+    Train the tire-failure model with `backend` and export it to ONNX.
+
+    Exported models are cached under <output dir>/.cache, keyed by the CSV
+    contents (or synthetic `rows`), backend, hyperparameters, library versions
+    and _CACHE_VERSION; an unchanged rerun copies the cached model and reports
+    its stored metrics instead of fitting again (unless `force`).
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}. Available: {list(BACKENDS)}")
+
+    cache_path = output_model.parent / ".cache" / f"{_model_cache_key(csv_path, backend, rows)}.onnx"
+    if not force and cache_path.exists():
+        output_model.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(cache_path, output_model)
+        metrics_path = cache_path.with_suffix(".json")
+        if metrics_path.exists():
+            _print_metrics(
+                json.loads(metrics_path.read_text(encoding="utf-8")),
+                note=" (metrics from cached model, not retrained)",
+            )
+        print(f"[ML] Reused cached ONNX model ({cache_path.name}): {output_model}")
+        return output_model
+
+    try:
         from sklearn.model_selection import train_test_split
         from sklearn.metrics import mean_squared_error
     except ImportError as exc:
         raise RuntimeError("scikit-learn is required for training") from exc
 
-    x, y = _load_or_generate_data(csv_path)
+    x, y = _load_or_generate_data(csv_path, rows)
     x_train, x_test, y_train, y_test = train_test_split(
         x, y, test_size=0.2, random_state=42
     )
 
-    model = RandomForestRegressor(
-        n_estimators=100,
-        max_depth=8,
-        random_state=42,
-        n_jobs=-1,
-    )
-    model.fit(x_train, y_train)
+    model = _fit_model(backend, x_train, y_train)
     preds = model.predict(x_test)
     mse = mean_squared_error(y_test, preds)
 
-    print(f"[ML] Training samples: {len(x_train)}")
-    print(f"[ML] Test samples: {len(x_test)}")
-    print(f"[ML] MSE: {mse:.6f}")
+    metrics = {
+        "backend": backend,
+        "train_samples": len(x_train),
+        "test_samples": len(x_test),
+        "mse": float(mse),
+    }
+    _print_metrics(metrics)
 
     # Export to ONNX
-    try:
-        from skl2onnx import convert_sklearn
-        from skl2onnx.common.data_types import FloatTensorType
-    except ImportError as exc:
-        raise RuntimeError("skl2onnx is required for ONNX export") from exc
-
-    initial_type = [("tire_signals", FloatTensorType([None, 6]))]
-    onnx_model = convert_sklearn(model, initial_types=initial_type)
+    onnx_model = _to_onnx(backend, model)
 
     output_model.parent.mkdir(parents=True, exist_ok=True)
     with open(output_model, "wb") as f:
         f.write(onnx_model.SerializeToString())
 
+    _store_cached_model(output_model, cache_path, metrics)
     print(f"[ML] Exported ONNX model: {output_model}")
     return output_model
 
@@ -113,11 +279,18 @@ def main() -> int:
     parser = argparse.ArgumentParser(description="Train tire-failure model and export ONNX")
     parser.add_argument("--csv", type=str, default="", help="Input CSV file")
     parser.add_argument("--output", type=str, default="models/tire_failure.onnx")
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="sklearn",
+        help="Regressor to train: sklearn RandomForest (default) or LightGBM (needs lightgbm + onnxmltools)",
+    )
+    parser.add_argument("--force", action="store_true", help="Retrain even if a cached model matches")
     args = parser.parse_args()
 
     csv_path = Path(args.csv) if args.csv else None
     output_model = Path(args.output)
-    train_and_export(csv_path, output_model)
+    train_and_export(csv_path, output_model, args.backend, force=args.force)
     return 0
 
 
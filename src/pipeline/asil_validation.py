@@ -15,8 +15,10 @@ back to mock examples for testing and CI sanity checks.
 
 from __future__ import annotations
 
+import os
 import subprocess
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Dict, List, Any, Optional
 from pathlib import Path
@@ -158,6 +160,22 @@ class AsilDValidator:
             evidence=evidence,
         )
 
+    def validate_many(self, source_paths: List[Path]) -> List[AsilCheckResult]:
+        """
+        Validate several C++ files concurrently, returning results in input order.
+
+        Each file's clang --analyze run is a separate process and the heuristic
+        scan is short, so worker threads overlap the analyzer runs.
+        """
+        if not source_paths:
+            return []
+        with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 1, len(source_paths))) as ex:
+            return list(ex.map(self._validate_file, source_paths))
+
+    def _validate_file(self, source_path: Path) -> AsilCheckResult:
+        code = source_path.read_text(encoding="utf-8", errors="replace")
+        return self.validate_cpp(code, source_path)
+
     def _run_clang_static_analyzer(self, source_path: Optional[Path]) -> Dict[str, Any]:
         """
         Run clang Static Analyzer (clang --analyze) if available and path exists.
@@ -10,7 +10,7 @@ from typing import Dict, Any
 from pathlib import Path
 
 from llm.client import get_client
-from llm.prompts import ML_WRAPPER_TEMPLATE
+from llm.prompts import ML_WRAPPER_TMPL
 
 
 class ONNXWrapperGenerator:
@@ -26,7 +26,7 @@ class ONNXWrapperGenerator:
         inputs = ml.get("inputs", [])
         outputs = ml.get("outputs", [])
 
-        prompt = ML_WRAPPER_TEMPLATE.format(
+        prompt = ML_WRAPPER_TMPL.substitute(
             model_name=model_name,
             model_path=model_path,
             inputs=inputs,
@@ -12,9 +12,14 @@ from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 from llm.client import get_client
 from llm.adversarial_client import get_auditor, get_architect
-from llm.prompts import SYSTEM_PROMPT, TEST_GENERATION_PROMPT, CODE_GENERATION_PROMPT
+from llm.prompts import SYSTEM_PROMPT, TEST_GENERATION_TMPL, CODE_GENERATION_TMPL
 from pipeline.validation_gate import get_validation_gate
 from pipeline.traceability import TraceabilityMatrix
 from pipeline.audit_logger import AuditLogger
@@ -227,8 +232,9 @@ class Pipeline:
     
     def _parse_requirement(self, path: str) -> Dict[str, Any]:
         """Load and validate requirement YAML."""
-        with open(path, 'r') as f:
-            req = yaml.safe_load(f)
+        # Raw bytes: libyaml detects and decodes the encoding itself.
+        with open(path, 'rb') as f:
+            req = yaml.load(f.read(), Loader=_YamlLoader)
             
         # Basic validation
         if "service" not in req:
@@ -243,7 +249,7 @@ class Pipeline:
         Generate tests FIRST using the AUDITOR agent.
         The Auditor is skeptical and creates comprehensive, strict tests.
         """
-        prompt = TEST_GENERATION_PROMPT.format(
+        prompt = TEST_GENERATION_TMPL.substitute(
             requirement_yaml=yaml.dump(requirement)
         )
         
@@ -263,7 +269,7 @@ class Pipeline:
         """
         protocol = requirement.get("service", {}).get("protocol", "none")
         
-        prompt = CODE_GENERATION_PROMPT.format(
+        prompt = CODE_GENERATION_TMPL.substitute(
             requirement_yaml=yaml.dump(requirement),
             test_code=test_code,
             language=language,
@@ -470,7 +476,7 @@ class Pipeline:
     def _generate_ota_package(self, service_name: str, requirement: Dict[str, Any]):
         """Generate OTA manifest and variant configurations."""
         try:
-            from codegen.ota.manifest_generator import OTAManifestGenerator
+            from codegen.ota.manifest_generator import MANIFEST_FORMAT_ENV, OTAManifestGenerator
             
             generator = OTAManifestGenerator()
             service_dir = self.output_dir / service_name
@@ -491,8 +497,9 @@ class Pipeline:
                 rollout_strategy="gradual"
             )
             
-            manifest_path = service_dir / "ota_manifest.yaml"
-            generator.save_manifest(manifest, manifest_path)
+            manifest_fmt = os.getenv(MANIFEST_FORMAT_ENV, "yaml")
+            manifest_path = service_dir / f"ota_manifest.{manifest_fmt}"
+            generator.save_manifest(manifest, manifest_path, fmt=manifest_fmt)
             
             # Generate variant configs
             base_config = {
@@ -12,8 +12,12 @@ from pathlib import Path
 from typing import Dict, List, Any
 import json
 
+from codegen.line_count import count_non_blank_lines
 from pipeline.asil_validation import AsilDValidator
 
+# Compiled once at import; each validate_* call is then a single C-level scan.
+_PUBLIC_CLASS = re.compile(r"public\s+class\s+([A-Za-z_][A-Za-z0-9_]*)")
+
 
 class ValidationGate:
     """
@@ -120,7 +124,7 @@ class ValidationGate:
                 return result  # Don't continue if syntax is broken
 
             # 1.1 Minimum service size gate (configurable)
-            line_count = sum(1 for line in code.splitlines() if line.strip())
+            line_count = count_non_blank_lines(code)
             if line_count < self.min_service_lines:
                 msg = f"Service size below target: {line_count} lines (target {self.min_service_lines})"
                 if self.strict_mode:
@@ -240,7 +244,7 @@ class ValidationGate:
                 result['static_analysis']['compilation'] = f'ERROR: {e}'
 
             # 1.1 Minimum service size gate (configurable)
-            line_count = sum(1 for line in code.splitlines() if line.strip())
+            line_count = count_non_blank_lines(code)
             if line_count < self.min_service_lines:
                 msg = f"Service size below target: {line_count} lines (target {self.min_service_lines})"
                 if self.strict_mode:
@@ -357,7 +361,7 @@ class ValidationGate:
             impl_file.write_text(code)
 
             # Minimum size gate (configurable)
-            line_count = sum(1 for line in code.splitlines() if line.strip())
+            line_count = count_non_blank_lines(code)
             if line_count < self.min_service_lines:
                 msg = f"Service size below target: {line_count} lines (target {self.min_service_lines})"
                 if self.strict_mode:
@@ -401,12 +405,12 @@ class ValidationGate:
 
         with tempfile.TemporaryDirectory() as tmpdir:
             tmpdir_path = Path(tmpdir)
-            class_match = re.search(r"public\s+class\s+([A-Za-z_][A-Za-z0-9_]*)", code)
+            class_match = _PUBLIC_CLASS.search(code)
             class_name = class_match.group(1) if class_match else "Implementation"
             impl_file = tmpdir_path / f"{class_name}.java"
             impl_file.write_text(code)
 
-            line_count = sum(1 for line in code.splitlines() if line.strip())
+            line_count = count_non_blank_lines(code)
             if line_count < self.min_service_lines:
                 msg = f"Service size below target: {line_count} lines (target {self.min_service_lines})"
                 if self.strict_mode:
@@ -447,7 +451,7 @@ class ValidationGate:
             'static_analysis': {},
         }
 
-        line_count = sum(1 for line in code.splitlines() if line.strip())
+        line_count = count_non_blank_lines(code)
         if line_count < self.min_service_lines:
             msg = f"Service size below target: {line_count} lines (target {self.min_service_lines})"
             if self.strict_mode:
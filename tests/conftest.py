@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+# src/ for the packages; scripts/ for the standalone scripts (run as python scripts/x.py).
+for path in (ROOT / "src", ROOT / "scripts"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
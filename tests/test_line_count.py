@@ -0,0 +1,13 @@
+"""Non-blank line counting used for the minimum-size checks."""
+
+import pytest
+
+from codegen.line_count import count_non_blank_lines
+
+
+@pytest.mark.parametrize(
+    "code",
+    ["", "\n\n", "a", "a\n", "  a\n\n\t\n b \r\nc", "x\n \n\ty\n\n", "\r\n\r\nz"],
+)
+def test_matches_strip_based_count(code):
+    assert count_non_blank_lines(code) == sum(1 for line in code.splitlines() if line.strip())
@@ -0,0 +1,45 @@
+"""Public OBD-II CSV loading and row capping."""
+
+import math
+
+import pandas as pd
+
+from prepare_public_vehicle_data import _cap_rows, _load_public_obd_csvs, _numeric
+
+HEADER = (
+    "Time,Vehicle Speed Sensor [km/h],Ambient Air Temperature [C],"
+    "Intake Manifold Absolute Pressure [kPa],Engine Coolant Temperature [C],"
+    "Accelerator Pedal Position D [%],Extra\n"
+)
+
+
+def test_files_disagreeing_on_column_type_coerce_to_nan(tmp_path):
+    # Arrow infers the speed column as double in a.csv and as string in b.csv.
+    (tmp_path / "a.csv").write_text(HEADER + "0,50.5,20,100,90,10,1\n1,60,21,101,91,11,2\n")
+    (tmp_path / "b.csv").write_text(HEADER + "0,ERR,22,102,92,12,x\n1,70,23,103,93,13,y\n")
+
+    raw = _load_public_obd_csvs(tmp_path)
+
+    speed = _numeric(raw, "vehicle_speed_kmh").tolist()
+    assert speed[:2] == [50.5, 60.0]
+    assert math.isnan(speed[2])
+    assert speed[3] == 70.0
+    assert raw.num_rows == 4
+
+
+def test_cap_rows_spreads_over_whole_frame():
+    frame = pd.DataFrame({"row": range(872)})
+
+    capped = _cap_rows(frame, 600)
+
+    rows = capped["row"].tolist()
+    assert len(rows) == 600
+    assert rows[0] == 0 and rows[-1] >= 870
+    assert rows == sorted(set(rows))
+
+
+def test_cap_rows_keeps_small_frames():
+    frame = pd.DataFrame({"row": range(10)})
+
+    assert _cap_rows(frame, 0) is frame
+    assert _cap_rows(frame, 10) is frame
@@ -0,0 +1,42 @@
+"""vsomeip_config.json rendering matches a plain json.dumps of the same config."""
+
+import json
+
+import pytest
+
+from codegen.protocol_adapter import _vsomeip_config_json
+
+
+def _expected(service_name, service_id, instance_id, event_ids):
+    return json.dumps(
+        {
+            "unicast": "127.0.0.1",
+            "applications": [{"name": f"{service_name}_app", "id": "0x1313"}],
+            "services": [
+                {
+                    "service": service_id,
+                    "instance": instance_id,
+                    "unreliable": "30509",
+                    "reliable": "30490",
+                    "events": event_ids,
+                }
+            ],
+            "routing": f"{service_name}_app",
+        },
+        indent=2,
+    ).encode("utf-8")
+
+
+@pytest.mark.parametrize(
+    "event_ids",
+    [[], ["0x8001"], ["0x8001", "0x8002", "0x8003"]],
+    ids=["no-events", "one-event", "several-events"],
+)
+def test_vsomeip_config_matches_json_dumps(event_ids):
+    args = ("TireMonitor", "0x1001", "0x0001", event_ids)
+    assert _vsomeip_config_json(*args) == _expected(*args)
+
+
+def test_vsomeip_config_escapes_strings():
+    args = ('Quote"Svc', "0x1001", "0x0001", ["ev\\1"])
+    assert _vsomeip_config_json(*args) == _expected(*args)